@@ -0,0 +1,321 @@
+"""
+Benchmark de la capa de datos.
+
+Genera bases de datos sintéticas de tamaño creciente (1x es el ejemplo de db_setup.py), mide cada
+función de lab_manager.data.queries y el camino completo del snapshot del dashboard, y guarda el
+EXPLAIN QUERY PLAN de cada consulta y la memoria que ocupan el snapshot y su motor de filtrado
+(100x pasa de 100.000 confirmaciones). No necesita pantalla ni PySide6.
+
+    python -m benchmarks.queries                         # compara con la línea base
+    python -m benchmarks.queries --scales 1 10 100 1000  # incluye la escala 1000x (tarda y ocupa ~1 GB)
+    python -m benchmarks.queries --save-baseline         # guarda el resultado actual como línea base
+    python -m benchmarks.queries --require-baseline      # en CI: falla si no hay línea base
+
+Termina con código 1 si algún plan de consulta cambia respecto a la línea base o si alguna mediana
+o medida de memoria la supera en más de --tolerance. La línea base depende del equipo y no se
+incluye en el repositorio: si no existe, la primera ejecución la guarda y termina bien, como
+benchmarks.startup sin línea base; con --require-baseline eso es un error.
+"""
+import argparse
+import gc
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from lab_manager.data import queries
+from lab_manager.data.database import configure_connection
+from lab_manager.data.generator import generate
+from lab_manager.data.instrumentation import EXPLAINABLE, explain
+from lab_manager.engine import FilterEngine
+from lab_manager.filters import FilterState
+
+BASELINE_FILE = Path(__file__).resolve().parent / "queries_baseline.json"
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_TOLERANCE = 0.50
+MIN_SLACK_MS = 0.5  # diferencias menores se consideran ruido aunque superen la tolerancia
+MIN_SLACK_KB = 64
+
+# Parámetros del generador por escala
+SCALES = {
+    1: dict(workstations=60, technicians=20, devices=7, versions=3),
+    10: dict(workstations=600, technicians=200, devices=14, versions=6),
+    100: dict(workstations=6000, technicians=2000, devices=35, versions=12),
+    1000: dict(workstations=60000, technicians=20000, devices=70, versions=20),
+}
+
+
+def dashboard_path(conn, ctx):
+    """Snapshot y filtrado tal como lo hace el dashboard: sin filtros, por fabricante y pendientes."""
+    snapshot = queries.get_dashboard_snapshot(conn)
+    engine = FilterEngine(snapshot)
+    visible = 0
+    for filters in (FilterState(), FilterState(ctx["manufacturer"]), FilterState(pending_only=True)):
+        matching = set(engine.matching_ids(filters))
+        visible += sum(1 for ws in snapshot.workstations if ws.technician is not None and ws.technician.id in matching)
+    return visible
+
+
+def read_benchmarks(ctx):
+    """Consultas de solo lectura como (nombre, función(conn))."""
+    tech_id, manufacturer, models = ctx["tech_id"], ctx["manufacturer"], ctx["models"]
+    return [
+        ("get_manufacturers", lambda conn: queries.get_manufacturers(conn)),
+        ("get_models_by_manufacturer", lambda conn: queries.get_models_by_manufacturer(conn, manufacturer)),
+        ("get_all_technicians", lambda conn: queries.get_all_technicians(conn)),
+        ("get_total_technicians", lambda conn: queries.get_total_technicians(conn)),
+        ("get_workstations_with_assignments", lambda conn: queries.get_workstations_with_assignments(conn)),
+        ("get_technician_devices", lambda conn: queries.get_technician_devices(conn, tech_id)),
+        ("get_pending_updates_count", lambda conn: queries.get_pending_updates_count(conn, tech_id)),
+        ("get_pending_updates_count_filtered",
+         lambda conn: queries.get_pending_updates_count(conn, tech_id, manufacturer, models)),
+        ("get_lab_stats", lambda conn: queries.get_lab_stats(conn)),
+        ("get_table_versions", lambda conn: queries.get_table_versions(conn)),
+        ("get_updates_for_technician", lambda conn: queries.get_updates_for_technician(conn, tech_id)),
+        ("get_latest_updates_for_technician",
+         lambda conn: queries.get_latest_updates_for_technician(conn, tech_id)),
+        ("get_technician_trainings", lambda conn: queries.get_technician_trainings(conn, tech_id)),
+        ("get_latest_device_updates", lambda conn: queries.get_latest_device_updates(conn)),
+        ("get_device_updates_page", lambda conn: queries.get_device_updates_page(conn)),
+        ("get_device_updates_page_filtered",
+         lambda conn: queries.get_device_updates_page(conn, "version", False, None, 200, manufacturer, models)),
+        ("count_device_updates", lambda conn: queries.count_device_updates(conn)),
+        ("get_dashboard_snapshot", lambda conn: queries.get_dashboard_snapshot(conn)),
+        ("get_dashboard_snapshot_supersede", lambda conn: queries.get_dashboard_snapshot(conn, supersede=True)),
+        ("search_workstations_serial", lambda conn: queries.search_workstations(conn, "PC_0001")),
+        ("search_workstations_manufacturer", lambda conn: queries.search_workstations(conn, manufacturer)),
+        ("count_dashboard_rows", lambda conn: queries.count_dashboard_rows(conn)),
+        ("iter_dashboard_rows", lambda conn: sum(1 for _ in queries.iter_dashboard_rows(conn))),
+        ("iter_dashboard_rows_pending",
+         lambda conn: sum(1 for _ in queries.iter_dashboard_rows(conn, manufacturer, pending_only=True))),
+        ("iter_dashboard_rows_pending_supersede",
+         lambda conn: sum(1 for _ in queries.iter_dashboard_rows(conn, manufacturer, pending_only=True,
+                                                                 supersede=True))),
+        ("iter_dashboard_rows_full_history",
+         lambda conn: sum(1 for _ in queries.iter_dashboard_rows(conn, limit_per_model=None))),
+        ("dashboard_path", lambda conn: dashboard_path(conn, ctx)),
+    ]
+
+
+def write_benchmarks(ctx):
+    """Escrituras como (nombre, función(conn, run)); cada ejecución escribe datos distintos."""
+    def add_updates(conn, run):
+        entries = [(manufacturer, model, f"bench-{run}") for manufacturer, model in ctx["devices"][:10]]
+        return queries.add_device_updates(conn, entries)
+
+    def confirm_pending(conn, run):
+        pairs = conn.execute("""
+            SELECT tuc.technician_id, tuc.update_id FROM TechnicianUpdateConfirmations tuc
+            WHERE tuc.confirmed = 0 LIMIT 1000
+        """).fetchall()
+        return queries.mark_updates_as_confirmed(conn, pairs)
+
+    def confirm_one(conn, run):
+        tech_id, update_id = conn.execute(
+            "SELECT technician_id, update_id FROM TechnicianUpdateConfirmations WHERE confirmed = 0 LIMIT 1"
+        ).fetchone()
+        return queries.mark_update_as_confirmed(conn, tech_id, update_id)
+
+    return [
+        ("add_device_updates", add_updates),
+        ("mark_update_as_confirmed", confirm_one),
+        ("mark_updates_as_confirmed", confirm_pending),
+    ]
+
+
+def capture_plans(conn, call):
+    """Ejecuta call() una vez y devuelve los planes distintos de las sentencias que ha lanzado."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+
+    plans = []
+    for sql in dict.fromkeys(statements):
+        if not sql.lstrip()[:6].upper().startswith(EXPLAINABLE):
+            continue
+        plan = explain(conn, sql)
+        if plan not in plans:
+            plans.append(plan)
+    return plans
+
+
+def time_calls(call, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 3), "min_ms": round(min(times), 3)}
+
+
+def traced_memory(build):
+    """Ejecuta build() y devuelve su resultado junto con la memoria que retiene y su pico, en KB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {"kb": round(current / 1024, 1), "peak_kb": round(peak / 1024, 1)}
+
+
+def measure_memory(conn):
+    """Memoria del snapshot del dashboard y de su motor de filtrado."""
+    snapshot, snapshot_memory = traced_memory(lambda: queries.get_dashboard_snapshot(conn))
+    _, engine_memory = traced_memory(lambda: FilterEngine(snapshot))
+    return {"snapshot": snapshot_memory, "filter_engine": engine_memory}
+
+
+def benchmark_context(conn):
+    """Argumentos representativos: el técnico asignado con más formaciones y uno de sus dispositivos."""
+    tech_id, manufacturer, model = conn.execute("""
+        SELECT a.technician_id, d.manufacturer, d.model
+        FROM Assignments a
+        JOIN Trainings t ON t.technician_id = a.technician_id
+        JOIN Devices d ON d.id = t.device_id
+        GROUP BY a.technician_id
+        ORDER BY COUNT(*) DESC, a.technician_id
+        LIMIT 1
+    """).fetchone()
+    devices = conn.execute("SELECT manufacturer, model FROM Devices ORDER BY id").fetchall()
+    return {"tech_id": tech_id, "manufacturer": manufacturer, "models": [model], "devices": devices}
+
+
+def run_scale(scale, workdir, repeat):
+    db_path = Path(workdir) / f"bench_{scale}x.db"
+    start = time.perf_counter()
+    sizes = generate(str(db_path), **SCALES[scale])
+    print(f"Escala {scale}x: base de datos generada en {time.perf_counter() - start:.1f} s "
+          f"({sizes['TechnicianUpdateConfirmations']} confirmaciones)")
+
+    conn = sqlite3.connect(db_path)
+    configure_connection(conn)
+    ctx = benchmark_context(conn)
+    results = {}
+    try:
+        for name, func in read_benchmarks(ctx):
+            plans = capture_plans(conn, lambda: func(conn))  # también sirve de calentamiento
+            results[name] = {**time_calls(lambda: func(conn), repeat), "plans": plans}
+
+        for name, func in write_benchmarks(ctx):
+            runs = iter(range(repeat + 1))
+            plans = capture_plans(conn, lambda: func(conn, next(runs)))
+            results[name] = {**time_calls(lambda: func(conn, next(runs)), repeat), "plans": plans}
+
+        memory = measure_memory(conn)
+    finally:
+        conn.close()
+        db_path.unlink(missing_ok=True)
+    return {"sizes": sizes, "benchmarks": results, "memory": memory}
+
+
+def print_table(report):
+    scales = list(report["scales"])
+    names = list(next(iter(report["scales"].values()))["benchmarks"])
+    print(f"\n{'consulta (mediana, ms)':<36}" + "".join(f"{s + 'x':>12}" for s in scales))
+    for name in names:
+        row = "".join(
+            f"{report['scales'][s]['benchmarks'][name]['median_ms']:>12.3f}"
+            if name in report["scales"][s]["benchmarks"] else f"{'-':>12}"
+            for s in scales
+        )
+        print(f"{name:<36}{row}")
+
+    print(f"\n{'memoria (retenida / pico, KB)':<36}" + "".join(f"{s + 'x':>20}" for s in scales))
+    for name in next(iter(report["scales"].values()))["memory"]:
+        row = "".join(
+            f"{report['scales'][s]['memory'][name]['kb']:>10.0f} /{report['scales'][s]['memory'][name]['peak_kb']:>7.0f}"
+            for s in scales
+        )
+        print(f"{name:<36}{row}")
+
+
+def compare(report, baseline, tolerance):
+    """Devuelve las regresiones de plan y de tiempo respecto a la línea base."""
+    problems = []
+    for scale, result in report["scales"].items():
+        base_scale = baseline.get("scales", {}).get(scale)
+        if base_scale is None:
+            continue
+        for name, current in result["benchmarks"].items():
+            base = base_scale["benchmarks"].get(name)
+            if base is None:
+                continue
+            if current["plans"] != base["plans"]:
+                problems.append(
+                    f"{scale}x {name}: el plan ha cambiado\n"
+                    f"    antes:   {json.dumps(base['plans'], ensure_ascii=False)}\n"
+                    f"    ahora:   {json.dumps(current['plans'], ensure_ascii=False)}"
+                )
+            limit = base["median_ms"] * (1 + tolerance)
+            if current["median_ms"] > limit and current["median_ms"] - base["median_ms"] > MIN_SLACK_MS:
+                problems.append(
+                    f"{scale}x {name}: {current['median_ms']:.3f} ms supera {limit:.3f} ms "
+                    f"(línea base {base['median_ms']:.3f} ms)"
+                )
+        for name, current in result.get("memory", {}).items():
+            base = base_scale.get("memory", {}).get(name)
+            if base is None:
+                continue
+            for key in ("kb", "peak_kb"):
+                limit = base[key] * (1 + tolerance)
+                if current[key] > limit and current[key] - base[key] > MIN_SLACK_KB:
+                    problems.append(
+                        f"{scale}x memoria de {name}: {current[key]:.0f} KB supera {limit:.0f} KB "
+                        f"(línea base {base[key]:.0f} KB)"
+                    )
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la capa de datos de Lab Manager")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, choices=sorted(SCALES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="guardar el resultado como JSON en este fichero")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="terminar con error si no hay línea base en lugar de guardarla")
+    args = parser.parse_args(argv)
+
+    report = {"sqlite_version": sqlite3.sqlite_version, "repeat": args.repeat, "scales": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            report["scales"][str(scale)] = run_scale(scale, tmp, args.repeat)
+    print_table(report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    if not BASELINE_FILE.exists() and args.require_baseline and not args.save_baseline:
+        print(f"\nERROR: no existe {BASELINE_FILE}; guárdala primero con --save-baseline", file=sys.stderr)
+        return 1
+    if args.save_baseline or not BASELINE_FILE.exists():
+        BASELINE_FILE.write_text(text, encoding="utf-8")
+        print(f"\nLínea base guardada en {BASELINE_FILE}")
+        return 0
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    if baseline.get("sqlite_version") != sqlite3.sqlite_version:
+        print(f"\nAviso: la línea base se tomó con SQLite {baseline.get('sqlite_version')} "
+              f"y ahora se usa {sqlite3.sqlite_version}; los planes pueden diferir")
+
+    problems = compare(report, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESIÓN: {problem}")
+    if not problems:
+        print(f"\nOK: planes iguales y tiempos y memoria dentro de un {args.tolerance:.0%} de la línea base")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
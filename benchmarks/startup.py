@@ -0,0 +1,115 @@
+"""
+Benchmark de arranque de la interfaz.
+
+Lanza varias veces `python -X importtime -m lab_manager --startup-report ... --exit-after-startup`
+con la plataforma Qt offscreen y mide el tiempo hasta el primer pintado de MainWindow.
+Termina con código 1 si la mediana supera el presupuesto o si se cargan dependencias pesadas
+(pandas, openpyxl, numpy) antes del primer pintado.
+
+    python -m benchmarks.startup                  # compara con la línea base o con --budget-ms
+    python -m benchmarks.startup --save-baseline  # guarda la mediana actual como línea base
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).resolve().parent / "startup_baseline.json"
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_TOLERANCE = 0.20  # margen sobre la línea base antes de considerarlo una regresión
+
+
+def parse_importtime(stderr, top=10):
+    """Devuelve los módulos con mayor tiempo acumulado según la salida de -X importtime."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        imports.append((int(fields[1]), fields[2].strip()))
+    imports.sort(reverse=True)
+    return imports[:top]
+
+
+def run_once(workdir, db_path=None):
+    """Arranca la aplicación una vez y devuelve (informe de arranque, stderr)."""
+    if db_path:
+        shutil.copy(db_path, workdir / "lab_manager.db")
+    report_file = workdir / "startup.json"
+    report_file.unlink(missing_ok=True)
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "lab_manager",
+         "--startup-report", str(report_file), "--exit-after-startup"],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=120
+    )
+    if proc.returncode != 0 or not report_file.exists():
+        raise RuntimeError(f"La aplicación no arrancó correctamente:\n{proc.stderr[-2000:]}")
+    return json.loads(report_file.read_text(encoding="utf-8")), proc.stderr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de Lab Manager")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db", help="base de datos a usar (por defecto una vacía)")
+    parser.add_argument("--budget-ms", type=float, help="presupuesto fijo para el primer pintado")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            report, stderr = run_once(Path(tmp), args.db)
+            reports.append(report)
+            if i == 0:
+                print("Importaciones más lentas (acumulado):")
+                for cumulative_us, name in parse_importtime(stderr):
+                    print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    first_paint = [r["first_paint_ms"] for r in reports]
+    median = statistics.median(first_paint)
+    print(f"Primer pintado: mediana {median:.1f} ms (mín {min(first_paint):.1f}, máx {max(first_paint):.1f})")
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps({"first_paint_ms": median}, indent=2) + "\n", encoding="utf-8")
+        print(f"Línea base guardada en {BASELINE_FILE}")
+        return 0
+
+    if args.budget_ms is not None:
+        budget = args.budget_ms
+    elif BASELINE_FILE.exists():
+        baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))["first_paint_ms"]
+        budget = baseline * (1 + args.tolerance)
+    else:
+        budget = DEFAULT_BUDGET_MS
+
+    failed = False
+    if median > budget:
+        print(f"REGRESIÓN: {median:.1f} ms supera el presupuesto de {budget:.1f} ms")
+        failed = True
+
+    heavy = sorted({m for r in reports for m in r["heavy_modules_loaded"]})
+    if heavy:
+        print(f"REGRESIÓN: módulos pesados cargados antes del primer pintado: {', '.join(heavy)}")
+        failed = True
+
+    if not failed:
+        print(f"OK: dentro del presupuesto de {budget:.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,166 +1,12 @@
-import sqlite3
-import random
+"""
+Crea lab_manager.db con los datos de ejemplo. Es un atajo del generador sintético:
 
-conn = sqlite3.connect('lab_manager.db')
-c = conn.cursor()
+    python db_setup.py                      # 60 estaciones, 20 técnicos, 7 dispositivos
+    python db_setup.py --technicians 2000   # acepta las mismas opciones que lab_manager.data.generator
+"""
+import sys
 
-c.executescript("""
-DROP TABLE IF EXISTS Workstations;
-DROP TABLE IF EXISTS Technicians;
-DROP TABLE IF EXISTS Devices;
-DROP TABLE IF EXISTS PCs;
-DROP TABLE IF EXISTS Assignments;
-DROP TABLE IF EXISTS DeviceUpdates;
-DROP TABLE IF EXISTS TechnicianUpdateConfirmations;
-DROP TABLE IF EXISTS Trainings;
+from lab_manager.data.generator import main
 
-CREATE TABLE Workstations (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
-    pos_x INTEGER NOT NULL,
-    pos_y INTEGER NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE TABLE Technicians (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE TABLE Devices (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    manufacturer TEXT NOT NULL,
-    model TEXT NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE TABLE PCs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    device_id INTEGER NOT NULL,
-    serial_number TEXT NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(device_id) REFERENCES Devices(id)
-);
-
-CREATE TABLE Assignments (
-    workstation_id INTEGER NOT NULL UNIQUE,
-    technician_id INTEGER NOT NULL UNIQUE,
-    pc_id INTEGER NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (workstation_id, technician_id),
-    FOREIGN KEY(workstation_id) REFERENCES Workstations(id),
-    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-    FOREIGN KEY(pc_id) REFERENCES PCs(id)
-);
-
-CREATE TABLE DeviceUpdates (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    device_id INTEGER NOT NULL,
-    version TEXT NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(device_id) REFERENCES Devices(id)
-);
-
-CREATE TABLE TechnicianUpdateConfirmations (
-    technician_id INTEGER NOT NULL,
-    update_id INTEGER NOT NULL,
-    confirmed INTEGER NOT NULL DEFAULT 0,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (technician_id, update_id),
-    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-    FOREIGN KEY(update_id) REFERENCES DeviceUpdates(id)
-);
-
-CREATE TABLE Trainings (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    technician_id INTEGER NOT NULL,
-    device_id INTEGER NOT NULL,
-    training_type TEXT NOT NULL, -- inicial, refuerzo
-    trainer_name TEXT,
-    competency_level TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-    FOREIGN KEY(device_id) REFERENCES Devices(id)
-);
-""")
-
-max_cols = 10
-max_rows = 6
-
-# Crear estaciones de trabajo
-workstations = []
-for row in range(max_rows):
-    for col in range(max_cols):
-        ws_name = f"WS_{row}_{col}"
-        workstations.append((ws_name, col, row))
-c.executemany("INSERT INTO Workstations (name, pos_x, pos_y) VALUES (?,?,?)", workstations)
-
-# Técnicos
-technicians = [
-    "Ana García", "Luis Martínez", "Marta López", "Carlos Sánchez", "Laura Fernández",
-    "David Rodríguez", "Elena Gómez", "Javier Ruiz", "Sofía Díaz", "Pablo Moreno",
-    "Isabel Jiménez", "Miguel Torres", "Carmen Ortega", "Alberto Molina", "Lucía Castillo",
-    "Fernando Ramos", "María Alonso", "José Vázquez", "Patricia Herrera", "Antonio Delgado"
-]
-c.executemany("INSERT INTO Technicians (name) VALUES (?)", [(t,) for t in technicians])
-
-# Dispositivos
-manufacturers_models = [
-    ("Apple", "MacBook Pro"), ("HP", "Spectre x360"), ("Dell", "XPS 15"),
-    ("Lenovo", "ThinkBook"), ("Asus", "ZenBook 14"), ("Acer", "Swift 3"),
-    ("MSI", "Prestige 15")
-]
-c.executemany("INSERT INTO Devices (manufacturer, model) VALUES (?,?)", manufacturers_models)
-
-# PCs
-pcs = [(i % len(manufacturers_models) + 1, f"PC_{i:03}") for i in range(1, max_cols*max_rows+1)]
-c.executemany("INSERT INTO PCs (device_id, serial_number) VALUES (?,?)", pcs)
-
-# Asignaciones
-ws_ids = list(range(1, max_cols*max_rows+1))
-tech_ids = list(range(1, len(technicians)+1))
-random.shuffle(ws_ids)
-random.shuffle(tech_ids)
-
-assignments = []
-for tech_id, ws_id in zip(tech_ids, ws_ids):
-    pc_id = ws_id
-    assignments.append((ws_id, tech_id, pc_id))
-c.executemany("INSERT INTO Assignments (workstation_id, technician_id, pc_id) VALUES (?,?,?)", assignments)
-
-# Trainings
-trainings = []
-training_types = ["inicial", "refuerzo"]
-for tech_id in tech_ids:
-    devices_for_training = random.sample(range(1, len(manufacturers_models)+1), random.randint(1, 4))
-    for device_id in devices_for_training:
-        training_type = random.choice(training_types)
-        trainer_name = random.choice(technicians)
-        competency_level = random.choice(["básico", "intermedio", "avanzado"])
-        trainings.append((tech_id, device_id, training_type, trainer_name, competency_level))
-c.executemany(
-    "INSERT INTO Trainings (technician_id, device_id, training_type, trainer_name, competency_level) VALUES (?,?,?,?,?)",
-    trainings
-)
-
-# DeviceUpdates
-du = []
-for device_id in range(1, len(manufacturers_models)+1):
-    for v in range(1, random.randint(2,4)):
-        du.append((device_id, f"v{v}.0"))
-c.executemany("INSERT INTO DeviceUpdates (device_id, version) VALUES (?,?)", du)
-
-# TechnicianUpdateConfirmations
-tuc = []
-for tech_id in tech_ids:
-    for device_id in range(1, len(manufacturers_models)+1):
-        c.execute("SELECT id FROM DeviceUpdates WHERE device_id=?", (device_id,))
-        updates = [row[0] for row in c.fetchall()]
-        for upd_id in updates:
-            confirmed = random.choice([0,0,0,1])
-            tuc.append((tech_id, upd_id, confirmed))
-c.executemany("INSERT INTO TechnicianUpdateConfirmations (technician_id, update_id, confirmed) VALUES (?,?,?)", tuc)
-
-conn.commit()
-conn.close()
+if __name__ == "__main__":
+    sys.exit(main())
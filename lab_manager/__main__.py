@@ -1,9 +1,6 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from lab_manager.main import MainWindow
+
+from lab_manager.cli import main
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    sys.exit(main())
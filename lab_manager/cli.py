@@ -0,0 +1,193 @@
+"""
+Punto de entrada de línea de comandos.
+
+Sin subcomando abre la interfaz gráfica. Los subcomandos generan informes sin importar PySide6,
+de modo que se pueden lanzar desde tareas programadas en servidores sin pantalla:
+
+    python -m lab_manager export informe.xlsx --manufacturer HP --pending
+    python -m lab_manager pending -o pendientes.csv
+    python -m lab_manager stats --json
+    python -m lab_manager rebuild-summary
+    python -m lab_manager rebuild-search
+
+Con --startup-report se muestra cuánto tarda cada fase del arranque de la interfaz y con
+--trace-sql se miden las consultas (en los subcomandos el resumen se escribe en stderr).
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from lab_manager.data.database import (DB_FILE, DEFAULT_JOURNAL_MODE, JOURNAL_MODES, get_manager, get_schema_version,
+                                       rebuild_pending_summary, rebuild_search_index)
+from lab_manager.data import instrumentation, queries
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lab_manager", description="Lab Manager")
+    parser.add_argument("--db", default=DB_FILE, help=f"ruta de la base de datos (por defecto {DB_FILE})")
+    parser.add_argument("--journal-mode", choices=JOURNAL_MODES, default=DEFAULT_JOURNAL_MODE,
+                        help="modo de journal de SQLite; \"delete\" para bases de datos en una unidad de red "
+                             f"(por defecto {DEFAULT_JOURNAL_MODE})")
+    parser.add_argument("--startup-report", nargs="?", const="-", metavar="FICHERO",
+                        help="informe de tiempos de arranque de la interfaz (en stderr o como JSON en FICHERO)")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="cerrar la interfaz tras el primer pintado (para medir el arranque)")
+    parser.add_argument("--trace-sql", nargs="?", type=float, const=instrumentation.SLOW_QUERY_MS, metavar="MS",
+                        help="medir las consultas y registrar las que tarden más de MS "
+                             f"(por defecto {instrumentation.SLOW_QUERY_MS:.0f})")
+    subparsers = parser.add_subparsers(dest="command")
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument("--manufacturer", help="filtrar por fabricante")
+    filters.add_argument("--model", action="append", dest="models", help="filtrar por modelo (repetible)")
+    filters.add_argument("--supersede", action="store_true",
+                         help="una versión confirmada da por confirmadas las anteriores del mismo dispositivo")
+
+    export_parser = subparsers.add_parser(
+        "export", parents=[filters],
+        help="exporta las actualizaciones de los técnicos asignados (.xlsx, .csv o .json)"
+    )
+    export_parser.add_argument("output", help="fichero de salida; el formato se deduce de la extensión")
+    export_parser.add_argument("--pending", action="store_true", help="solo actualizaciones pendientes")
+    export_parser.add_argument("--full-history", action="store_true",
+                               help="incluir todo el historial en lugar de las 2 últimas versiones por modelo")
+
+    pending_parser = subparsers.add_parser(
+        "pending", parents=[filters],
+        help="informe de actualizaciones pendientes"
+    )
+    pending_parser.add_argument("-o", "--output", help="fichero de salida (.xlsx, .csv o .json); por defecto la consola")
+
+    stats_parser = subparsers.add_parser("stats", help="resumen del laboratorio")
+    stats_parser.add_argument("--json", action="store_true", help="salida en formato JSON")
+
+    subparsers.add_parser("rebuild-summary", help="recalcula el resumen de actualizaciones pendientes")
+    subparsers.add_parser("rebuild-search", help="recalcula el índice de búsqueda del dashboard")
+
+    return parser
+
+
+def open_database(db_path, journal_mode=DEFAULT_JOURNAL_MODE):
+    """Abre una base de datos existente, aplicando las migraciones pendientes."""
+    if not Path(db_path).exists():
+        raise SystemExit(f"No existe la base de datos: {db_path}")
+    return get_manager(db_path, journal_mode).writer()
+
+
+def run_export(conn, args):
+    from lab_manager.utils import export
+
+    limit_per_model = None if args.full_history else 2
+    try:
+        written = export.export_dashboard(conn, args.output, args.manufacturer, args.models, args.pending,
+                                          limit_per_model, supersede=args.supersede)
+    except ValueError as e:  # extensión de salida no soportada
+        print(e, file=sys.stderr)
+        return 2
+    print(f"Exportadas {written} filas a {args.output}")
+
+
+def run_pending(conn, args):
+    from lab_manager.utils import export
+
+    if args.output:
+        try:
+            written = export.export_dashboard(conn, args.output, args.manufacturer, args.models, pending_only=True,
+                                              supersede=args.supersede)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        print(f"Exportadas {written} filas a {args.output}")
+        return
+
+    for ws_name, tech_name, pc_serial, manufacturer, model, version, confirmed in queries.iter_dashboard_rows(
+            conn, args.manufacturer, args.models, pending_only=True, supersede=args.supersede):
+        print(f"{ws_name}\t{tech_name}\t{pc_serial or ''}\t{manufacturer} {model}: {version}")
+
+
+def run_stats(conn, args):
+    stats = queries.get_lab_stats(conn)
+    stats["schema_version"] = get_schema_version(conn)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+def run_rebuild_summary(conn, args):
+    pairs = rebuild_pending_summary(conn)
+    print(f"Resumen de pendientes recalculado: {pairs} pares técnico-dispositivo")
+
+
+def run_rebuild_search(conn, args):
+    entries = rebuild_search_index(conn)
+    print(f"Índice de búsqueda recalculado: {entries} entradas")
+
+
+def run_gui(db_path=DB_FILE, journal_mode=DEFAULT_JOURNAL_MODE, startup_report=None, exit_after_startup=False):
+    from lab_manager.startup import StartupTimer, watch_first_paint
+
+    timer = StartupTimer(_START)
+    timer.mark("intérprete y cli")
+
+    from PySide6.QtWidgets import QApplication
+    timer.mark("importar Qt")
+    from lab_manager.main import MainWindow
+    timer.mark("importar ventana")
+
+    app = QApplication(sys.argv)
+    timer.mark("QApplication")
+    window = MainWindow(get_manager(db_path, journal_mode))
+    timer.mark("MainWindow")
+
+    def on_first_paint():
+        timer.mark("mostrar y pintar")
+        if startup_report:
+            timer.report(startup_report)
+        if exit_after_startup:
+            app.quit()
+
+    watch_first_paint(window, on_first_paint)
+    window.show()
+    return app.exec()
+
+
+COMMANDS = {
+    "export": run_export,
+    "pending": run_pending,
+    "stats": run_stats,
+    "rebuild-summary": run_rebuild_summary,
+    "rebuild-search": run_rebuild_search,
+}
+
+
+def print_query_stats():
+    print("Consultas:", file=sys.stderr)
+    for row in instrumentation.get_stats():
+        print(f"  {row['name']:<36} {row['count']:>6} llamadas {row['total_ms']:>10.1f} ms "
+              f"(p95 {row['p95_ms']:.1f} ms)", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace_sql is not None:
+        logging.basicConfig(format="%(name)s: %(message)s")
+        instrumentation.enable(args.trace_sql)
+    if args.command is None:
+        return run_gui(args.db, args.journal_mode, args.startup_report, args.exit_after_startup)
+
+    conn = open_database(args.db, args.journal_mode)
+    try:
+        status = COMMANDS[args.command](conn, args)
+    finally:
+        get_manager(args.db).close_all()
+    if args.trace_sql is not None:
+        print_query_stats()
+    return status or 0
@@ -1,15 +1,26 @@
 import sys
 import sqlite3
 import datetime
+import time
+from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QComboBox, QListWidget, QListWidgetItem, QGridLayout, QGroupBox, QScrollArea,
-    QSizePolicy, QCheckBox, QFileDialog, QSplitter, QFrame
+    QSizePolicy, QCheckBox, QFileDialog, QSplitter, QFrame, QStackedWidget, QMessageBox,
+    QMenu, QProgressDialog, QLineEdit
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from functools import partial
-from lab_manager.data.database import get_connection, init_db
+from lab_manager.data.database import get_manager
+from lab_manager.data.cache import get_reference_cache
 from lab_manager.data import queries
+from lab_manager.dashboard_list import DashboardListView, TechnicianIdRole
+from lab_manager.filters import FilterState, filter_updates
+from lab_manager.worker import QueryWorker
+from lab_manager.watcher import ChangeWatcher
+from lab_manager.profiling import (render_profiler, PHASE_QUERY, PHASE_FILTER, PHASE_BUILD,
+                                   PHASE_LAYOUT, PHASE_SIDEBARS)
+from lab_manager.startup import watch_first_paint
 
 from lab_manager.utils import export
 
@@ -20,16 +31,89 @@ FIXED_HEIGHT = 180
 MAX_COLS = 10
 MAX_ROWS = 6
 MAX_SCALE = 2  # factor máximo de expansión
+FILTER_DEBOUNCE_MS = 150  # ventana para agrupar cambios de filtro seguidos
+INCREMENTAL_REFRESH_LIMIT = 20  # técnicos afectados a partir de los que se repinta todo el snapshot
+SEARCH_DEBOUNCE_MS = 120  # pausa al escribir tras la que se lanza la búsqueda
+SEARCH_HIGHLIGHT_STYLE = "QGroupBox { border: 2px solid #e0a000; }"
+
+# Tablas de las que depende cada vista, para refrescar solo lo necesario cuando cambian
+SNAPSHOT_TABLES = {"Workstations", "Technicians", "Assignments", "PCs", "Devices",
+                   "Trainings", "DeviceUpdates", "TechnicianUpdateConfirmations"}
+LATEST_UPDATES_TABLES = {"Devices", "DeviceUpdates"}
+FILTER_OPTION_TABLES = {"Devices"}
+
+
+def load_dashboard_data(conn, supersede=False):
+    """
+    Consulta del snapshot del dashboard, su motor de filtrado y la duración de ambos en ms.
+    Se ejecuta en el hilo del worker.
+    """
+    # numpy solo se importa aquí: cargarlo antes del primer pintado retrasa la primera ventana
+    from lab_manager.engine import FilterEngine
+
+    start = time.perf_counter()
+    snapshot = queries.get_dashboard_snapshot(conn, supersede=supersede)
+    engine = FilterEngine(snapshot)
+    return snapshot, engine, (time.perf_counter() - start) * 1000
+
+
+def load_latest_updates(conn):
+    """Consulta de la barra de últimas actualizaciones y su duración en ms. Se ejecuta en el hilo del worker."""
+    start = time.perf_counter()
+    updates = queries.get_latest_device_updates(conn, limit=20)
+    return updates, (time.perf_counter() - start) * 1000
+
+
+def load_search_results(conn, text):
+    """Búsqueda del dashboard junto con el texto buscado. Se ejecuta en el hilo del worker."""
+    return text, queries.search_workstations(conn, text)
+
+
+def count_widgets(widget):
+    """Número de widgets de un árbol, incluido el propio widget; 0 si el perfil no cuenta widgets."""
+    if not render_profiler.count_widgets:
+        return 0
+    return 1 + len(widget.findChildren(QWidget))
+
+
+def count_live_widgets():
+    """Widgets vivos en la aplicación; 0 si el perfil no cuenta widgets."""
+    if not render_profiler.count_widgets:
+        return 0
+    return len(QApplication.allWidgets())
+
+
+def export_dashboard_rows(conn, report_progress, is_cancelled, path, filters, limit_per_model):
+    """Exporta en streaming las filas del dashboard desde el cursor. Se ejecuta en el hilo del worker."""
+    export.export_dashboard(
+        conn, path, filters.manufacturer, filters.models, filters.pending_only, limit_per_model,
+        progress=report_progress, is_cancelled=is_cancelled, supersede=filters.supersede
+    )
+    return path
 
 
 class Dashboard(QWidget):
-    def __init__(self):
+    def __init__(self, manager=None):
         super().__init__()
         self.setWindowTitle("Lab Manager - Dashboard")
         self.resize(1000, 700)
 
-        init_db()
-        self.conn = get_connection()
+        self.manager = manager or get_manager()
+        self.conn = self.manager.writer()
+        self.cache = get_reference_cache(self.manager)
+
+        self.snapshot = None
+        self.engine = None
+        self.applied_filters = None
+        self.visible_workstations = {}
+        self.ws_cells = {}
+        self.search_text = ""
+        self.search_hits = []
+        self.search_pos = -1
+        self.worker = QueryWorker(self.manager, parent=self)
+        self.worker.finished.connect(self.on_query_finished)
+        self.worker.failed.connect(self.on_query_failed)
+        self.worker.progress.connect(self.on_export_progress)
 
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
@@ -48,7 +132,7 @@ class Dashboard(QWidget):
 
         self.manufacturer_cb = QComboBox()
         self.manufacturer_cb.addItem("Todas")
-        manufacturers = queries.get_manufacturers(self.conn)
+        manufacturers = self.cache.manufacturers()
         self.manufacturer_cb.addItems(manufacturers)
         self.manufacturer_cb.setFixedWidth(150)
         filter_layout.addWidget(self.manufacturer_cb, alignment=Qt.AlignmentFlag.AlignTop)
@@ -62,12 +146,21 @@ class Dashboard(QWidget):
         self.model_list.setMaximumHeight(80)
         self.model_list.setMaximumWidth(180)
         self.model_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.model_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.model_list.customContextMenuRequested.connect(self.show_model_menu)
         filter_layout.addWidget(self.model_list, alignment=Qt.AlignmentFlag.AlignTop)
-        self.model_list.itemChanged.connect(self.update_dashboard)
+        self.model_list.itemChanged.connect(self.schedule_refresh)
 
         self.pending_cb = QCheckBox("Pendientes de actualizar / notificar")
         filter_layout.addWidget(self.pending_cb, alignment=Qt.AlignmentFlag.AlignTop)
-        self.pending_cb.stateChanged.connect(self.update_dashboard)
+        self.pending_cb.stateChanged.connect(self.schedule_refresh)
+
+        self.supersede_cb = QCheckBox("Confirmar una versión confirma las anteriores")
+        self.supersede_cb.setToolTip(
+            "Las versiones anteriores a la última confirmada de cada dispositivo no cuentan como pendientes"
+        )
+        filter_layout.addWidget(self.supersede_cb, alignment=Qt.AlignmentFlag.AlignTop)
+        self.supersede_cb.stateChanged.connect(self.schedule_refresh)
 
         filter_layout.addStretch()
 
@@ -79,15 +172,37 @@ class Dashboard(QWidget):
         self.toggle_sidebar_left_btn.clicked.connect(lambda checked: self.left_sidebar_scroll.setVisible(checked))
         tech_view_layout.addWidget(self.toggle_sidebar_left_btn)
 
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar técnico, puesto, PC, dispositivo o versión")
+        self.search_edit.setToolTip("Intro salta a la siguiente coincidencia")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setFixedWidth(300)
+        self.search_edit.textChanged.connect(self.schedule_search)
+        self.search_edit.returnPressed.connect(self.next_search_match)
+        tech_view_layout.addWidget(self.search_edit)
+
+        self.search_label = QLabel()
+        tech_view_layout.addWidget(self.search_label)
+
         tech_view_layout.addStretch()
 
         self.tech_count_label = QLabel("Técnicos disponibles: 0")
         self.tech_count_label.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         tech_view_layout.addWidget(self.tech_count_label, alignment=Qt.AlignmentFlag.AlignVCenter)
 
-        self.export_btn = QPushButton("Excel")
+        self.export_btn = QPushButton("Exportar")
         tech_view_layout.addWidget(self.export_btn)
-        self.export_btn.clicked.connect(self.export_current_dashboard)
+        export_menu = QMenu(self.export_btn)
+        export_menu.addAction("Actualizaciones visibles", lambda: self.export_current_dashboard(full_history=False))
+        export_menu.addAction("Historial completo", lambda: self.export_current_dashboard(full_history=True))
+        self.export_btn.setMenu(export_menu)
+
+        self.confirm_filtered_btn = QPushButton("Confirmar pendientes")
+        self.confirm_filtered_btn.setToolTip(
+            "Marcar como actualizadas todas las versiones sin confirmar de los técnicos filtrados,\n"
+            "también las anteriores que no se muestran")
+        tech_view_layout.addWidget(self.confirm_filtered_btn)
+        self.confirm_filtered_btn.clicked.connect(self.confirm_filtered)
 
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.VLine)
@@ -137,9 +252,18 @@ class Dashboard(QWidget):
         self.grid_layout.setContentsMargins(0, 0, 0, 0)
         self.dashboard_widget.setLayout(self.grid_layout)
 
-        ws_scroll = QScrollArea()
-        ws_scroll.setWidgetResizable(True)
-        ws_scroll.setWidget(self.dashboard_widget)
+        self.ws_scroll = QScrollArea()
+        self.ws_scroll.setWidgetResizable(True)
+        self.ws_scroll.setWidget(self.dashboard_widget)
+
+        self.list_view = DashboardListView()
+        self.list_view.delegate.confirm_requested.connect(self.mark_update)
+        self.list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.list_view.customContextMenuRequested.connect(self.show_list_menu)
+
+        self.view_stack = QStackedWidget()
+        self.view_stack.addWidget(self.ws_scroll)
+        self.view_stack.addWidget(self.list_view)
 
         self.sidebar = QWidget()
         self.sidebar_layout = QVBoxLayout()
@@ -159,7 +283,7 @@ class Dashboard(QWidget):
         self.left_sidebar_scroll.setMinimumWidth(100)
         self.left_sidebar_scroll.setMaximumWidth(400)
         splitter.addWidget(self.left_sidebar_scroll)
-        splitter.addWidget(ws_scroll)
+        splitter.addWidget(self.view_stack)
         self.sidebar_scroll.setMinimumWidth(100)
         self.sidebar_scroll.setMaximumWidth(400)
         splitter.addWidget(self.sidebar_scroll)
@@ -168,281 +292,569 @@ class Dashboard(QWidget):
         main_layout.setStretch(0, 0)
         main_layout.setStretch(1, 1)
 
+        # Los cambios de filtro se agrupan y solo se aplican tras FILTER_DEBOUNCE_MS sin cambios
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.refresh_timer.timeout.connect(self.apply_filters)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+
+        # Refresca las vistas afectadas cuando otra estación modifica la base de datos
+        self.watcher = ChangeWatcher(self.manager, parent=self)
+        self.watcher.tables_changed.connect(self.on_tables_changed)
+
         self.update_model_list()
-        self.update_technician_list()
-    
+        # El primer snapshot se pide tras el primer pintado para que el motor de filtrado (numpy)
+        # no compita con el arranque
+        watch_first_paint(self, self.apply_filters)
+        self.update_latest_updates_list()
+        self.watcher.start()
+
     def set_view_mode(self, mode):
         self.view_mode = mode
         self.grid_btn.setChecked(mode == "lab")
         self.list_btn.setChecked(mode == "list")
-        self.update_dashboard()
+        # El snapshot no depende de la vista: basta con volver a pintarlo
+        if self.snapshot is not None:
+            self.render_dashboard()
 
     def update_model_list(self):
+        self.fill_model_list()
+        self.schedule_refresh()
+
+    def fill_model_list(self, checked=()):
+        """Carga los modelos del fabricante seleccionado, marcando los indicados en checked."""
         manufacturer_filter = self.manufacturer_cb.currentText()
-        models = queries.get_models_by_manufacturer(self.conn, manufacturer_filter)
+        models = self.cache.models(manufacturer_filter)
 
         self.model_list.blockSignals(True)
         self.model_list.clear()
         for model in models:
             item = QListWidgetItem(model)
             item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(Qt.CheckState.Unchecked)
+            item.setCheckState(Qt.CheckState.Checked if model in checked else Qt.CheckState.Unchecked)
             self.model_list.addItem(item)
         self.model_list.blockSignals(False)
 
-        self.update_dashboard()
+    def reload_filter_options(self):
+        """Vuelve a cargar fabricantes y modelos conservando la selección actual."""
+        filters = self.current_filters()
 
-    def update_dashboard(self):
-        # Limpiar grid
-        for i in reversed(range(self.grid_layout.count())):
-            widget = self.grid_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
+        self.manufacturer_cb.blockSignals(True)
+        self.manufacturer_cb.clear()
+        self.manufacturer_cb.addItem("Todas")
+        self.manufacturer_cb.addItems(self.cache.manufacturers())
+        self.manufacturer_cb.setCurrentIndex(max(self.manufacturer_cb.findText(filters.manufacturer), 0))
+        self.manufacturer_cb.blockSignals(False)
 
-        manufacturer_filter = self.manufacturer_cb.currentText()
-        selected_models = [
+        self.fill_model_list(filters.models)
+        self.schedule_refresh()
+
+    def current_filters(self):
+        """Devuelve el FilterState que reflejan ahora mismo los controles."""
+        selected_models = tuple(
             self.model_list.item(i).text()
             for i in range(self.model_list.count())
             if self.model_list.item(i).checkState() == Qt.CheckState.Checked
-        ]
-        filter_active = (manufacturer_filter != "Todas") or (len(selected_models) > 0)
+        )
+        return FilterState(self.manufacturer_cb.currentText(), selected_models, self.pending_cb.isChecked(),
+                           self.supersede_cb.isChecked())
+
+    def schedule_refresh(self):
+        """Reinicia la ventana de agrupación; el refresco se hace al expirar."""
+        self.refresh_timer.start()
+
+    def apply_filters(self):
+        """Refresca el dashboard si los filtros han cambiado desde el último refresco."""
+        self.refresh_timer.stop()
+        filters = self.current_filters()
+        if filters == self.applied_filters:
+            return
+        self.applied_filters = filters
+        # El snapshot solo depende del modo de sustitución y el watcher lo mantiene al día: en
+        # los demás casos basta con repintar
+        if self.snapshot is None or self.snapshot.supersede != filters.supersede:
+            self.update_dashboard()
+        else:
+            self.render_dashboard()
 
-        # Total de técnicos
-        total_techs = queries.get_total_technicians(self.conn)
+    def update_dashboard(self):
+        """Pide un snapshot nuevo en segundo plano; si había otro en curso se descarta."""
+        self.worker.submit("dashboard", load_dashboard_data, self.applied_filters.supersede)
+
+    def update_latest_updates_list(self):
+        self.worker.submit("latest_updates", load_latest_updates)
+
+    def on_tables_changed(self, tables):
+        """Refresca solo las vistas que dependen de las tablas modificadas."""
+        if tables & FILTER_OPTION_TABLES:
+            self.reload_filter_options()
+        if tables & LATEST_UPDATES_TABLES:
+            self.update_latest_updates_list()
+        # Hasta el primer apply_filters (tras el primer pintado) no hay snapshot que refrescar
+        if tables & SNAPSHOT_TABLES and self.applied_filters is not None:
+            self.update_dashboard()
+            if self.search_text:
+                self.run_search()
+
+    def on_query_finished(self, key, result):
+        if key == "dashboard":
+            self.snapshot, self.engine, query_ms = result
+            self.render_dashboard(query_ms)
+        elif key == "latest_updates":
+            updates, query_ms = result
+            record = render_profiler.begin("últimas actualizaciones")
+            record.add(PHASE_QUERY, query_ms)
+            with record.phase(PHASE_SIDEBARS):
+                self.update_latest_updates(updates)
+            record.live_widgets = count_live_widgets()
+        elif key == "search":
+            self.set_search_results(*result)
+        elif key == "export":
+            self.close_export_progress()
+            print(f"Exportado a {result}")
+
+    def on_query_failed(self, key, message):
+        if key == "export":
+            self.close_export_progress()
+        QMessageBox.critical(self, "Error", f"Ocurrió un problema al consultar la base de datos: {message}")
+
+    def render_dashboard(self, query_ms=None):
+        """
+        Pinta el dashboard a partir del último snapshot cargado y de los filtros actuales.
+        query_ms es la duración de la consulta cuando el repintado viene de un snapshot nuevo.
+        """
+        record = render_profiler.begin("completo" if query_ms is not None else "repintado")
+        if query_ms is not None:
+            record.add(PHASE_QUERY, query_ms)
+
+        with record.phase(PHASE_BUILD):
+            # Limpiar grid
+            for i in reversed(range(self.grid_layout.count())):
+                widget = self.grid_layout.itemAt(i).widget()
+                if widget:
+                    record.widgets_destroyed += count_widgets(widget)
+                    widget.setParent(None)
+
+        with record.phase(PHASE_FILTER):
+            filters = self.applied_filters
+            workstations = self.snapshot.workstations
+
+            # Total de técnicos
+            total_techs = len({ws.technician.id for ws in workstations if ws.technician is not None})
+
+            # Estaciones visibles junto con las actualizaciones a mostrar de su técnico
+            matching = set(self.engine.matching_ids(filters))
+            visible = []
+            for workstation in workstations:
+                technician = workstation.technician
+                if technician is None:
+                    if self.view_mode == "lab" and not (filters.active or filters.pending_only):
+                        visible.append((workstation, None))
+                    continue
 
-        ws_rows = queries.get_workstations_with_assignments(self.conn)
-        num_techs = 0
-        row_counter = 0
+                # Filtrado de dispositivos según formaciones y pendientes
+                if technician.id not in matching:
+                    continue
+                visible.append((workstation, filter_updates(technician, filters)))
 
-        for ws_id, tech_id, ws_name, tech_name, pos_x, pos_y, pc_serial in ws_rows:
-            pending_only = self.pending_cb.isChecked()
+            # Estado para poder refrescar solo las celdas afectadas (ver refresh_technician)
+            self.visible_workstations = {
+                ws.technician.id: ws for ws, updates in visible if ws.technician is not None
+            }
+            self.cells = {}
+            self.ws_cells = {}
+            self.num_techs = len(self.visible_workstations)
+            self.total_techs = total_techs
 
-            if tech_id is None and (filter_active or pending_only):
-                continue
+        if self.view_mode == "lab":
+            with record.phase(PHASE_BUILD):
+                self.list_view.list_model.set_entries([])
+                for workstation, updates in visible:
+                    cell = self.build_workstation_cell(workstation, updates)
+                    record.widgets_created += count_widgets(cell)
+                    self.grid_layout.addWidget(cell, workstation.pos_y, workstation.pos_x)
+                    self.ws_cells[workstation.id] = cell
+                    if workstation.technician is not None:
+                        self.cells[workstation.technician.id] = cell
+
+                # Rellenar celdas vacías
+                for row in range(MAX_ROWS):
+                    for col in range(MAX_COLS):
+                        if not self.grid_layout.itemAtPosition(row, col):
+                            placeholder = QWidget()
+                            placeholder.setFixedSize(FIXED_WIDTH, FIXED_HEIGHT)
+                            self.grid_layout.addWidget(placeholder, row, col)
+                            record.widgets_created += 1
+                self.view_stack.setCurrentIndex(0)
+            with record.phase(PHASE_LAYOUT):
+                self.grid_layout.activate()
+        else:
+            with record.phase(PHASE_BUILD):
+                self.list_view.list_model.set_entries(
+                    [(ws.technician.id, ws.technician.name, updates) for ws, updates in visible]
+                )
+                self.view_stack.setCurrentIndex(1)
+            with record.phase(PHASE_LAYOUT):
+                self.list_view.doItemsLayout()
+
+        with record.phase(PHASE_BUILD):
+            self.highlight_search_matches()
+
+        with record.phase(PHASE_SIDEBARS):
+            self.update_tech_count()
+            self.update_technician_list()
+        record.live_widgets = count_live_widgets()
+
+    def schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        """Lanza en segundo plano la búsqueda del texto actual; si había otra en curso se descarta."""
+        self.search_timer.stop()
+        text = self.search_edit.text().strip()
+        if queries.build_search_query(text) is None:
+            self.worker.cancel("search")
+            self.set_search_results("", [])
+            return
+        self.worker.submit("search", load_search_results, text)
+
+    def set_search_results(self, text, hits):
+        """
+        Guarda las coincidencias (ws_id, tech_id) de una búsqueda y las resalta. Si el texto
+        es nuevo se salta a la primera visible; si es la misma búsqueda repetida tras un cambio
+        en la base de datos, se conserva la posición.
+        """
+        is_new = text != self.search_text
+        self.search_text = text
+        self.search_hits = hits
+        if is_new:
+            self.search_pos = -1
+        self.highlight_search_matches()
+        if is_new:
+            self.next_search_match()
+
+    def visible_search_matches(self):
+        """Coincidencias que se ven con los filtros y la vista actuales, por relevancia."""
+        if self.view_mode == "lab":
+            return [(ws_id, tech_id) for ws_id, tech_id in self.search_hits if ws_id in self.ws_cells]
+        return [(ws_id, tech_id) for ws_id, tech_id in self.search_hits if tech_id in self.visible_workstations]
 
-            pc_label = f" ({pc_serial})" if pc_serial else ""
+    def highlight_search_matches(self):
+        """Resalta las celdas o filas de las coincidencias y actualiza el contador."""
+        visible = self.visible_search_matches()
+        if self.view_mode == "lab":
+            matched = {ws_id for ws_id, _ in visible}
+            for ws_id, cell in self.ws_cells.items():
+                cell.setStyleSheet(SEARCH_HIGHLIGHT_STYLE if ws_id in matched else "")
+        else:
+            self.list_view.list_model.set_highlighted(tech_id for _, tech_id in visible)
+
+        if not self.search_text:
+            self.search_label.setText("")
+        elif len(visible) == len(self.search_hits):
+            self.search_label.setText(f"{len(visible)} coincidencias")
+        else:
+            self.search_label.setText(f"{len(visible)} coincidencias ({len(self.search_hits)} con otros filtros)")
+
+    def next_search_match(self):
+        """Desplaza la vista hasta la siguiente coincidencia visible."""
+        visible = self.visible_search_matches()
+        if not visible:
+            return
+        self.search_pos = (self.search_pos + 1) % len(visible)
+        ws_id, tech_id = visible[self.search_pos]
+        if self.view_mode == "lab":
+            self.ws_scroll.ensureWidgetVisible(self.ws_cells[ws_id])
+        else:
+            index = self.list_view.list_model.technician_index(tech_id)
+            self.list_view.scrollTo(index, DashboardListView.ScrollHint.PositionAtTop)
+
+    def update_tech_count(self):
+        self.tech_count_label.setText(f"Técnicos: {self.num_techs} / {self.total_techs}")
+
+    def build_workstation_cell(self, workstation, updates):
+        """Construye la celda de la vista de laboratorio para una estación."""
+        pc_label = f" ({workstation.pc_serial})" if workstation.pc_serial else ""
+
+        group = QGroupBox(f"{workstation.name}{pc_label}")
+        group.setFixedSize(FIXED_WIDTH, FIXED_HEIGHT)
+        group_layout = QVBoxLayout()
+        group_layout.setContentsMargins(0, 0, 0, 0)
+        group_layout.setSpacing(0)
+        group.setLayout(group_layout)
+
+        inner_widget = QWidget()
+        v_layout = QVBoxLayout()
+        v_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        v_layout.setContentsMargins(0, 0, 0, 0)
+        v_layout.setSpacing(0)
+        inner_widget.setLayout(v_layout)
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(inner_widget)
+        scroll_area.setContentsMargins(0, 0, 0, 0)
+        scroll_area.setStyleSheet("QScrollArea { border-top: none; }")
+
+        group_layout.addWidget(scroll_area)
+
+        # Si no hay técnico
+        technician = workstation.technician
+        if technician is None:
+            no_technician = QLabel("Sin técnico")
+            no_technician.setContentsMargins(2, 0, 0, 0)
+            v_layout.addWidget(no_technician)
+            return group
+
+        group.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        group.customContextMenuRequested.connect(
+            lambda pos: self.show_technician_menu(technician.id, group.mapToGlobal(pos))
+        )
 
-            if self.view_mode == "list":
-                group = QWidget()
-                group_layout = QVBoxLayout()
-                group_layout.setContentsMargins(0, 0, 0, 0)
-                group_layout.setSpacing(0)
-                group.setLayout(group_layout)
-                group.setFixedWidth(400)
-                group.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        # Nombre del técnico
+        technician_label = QLabel(f"Técnico: {technician.name}")
+        technician_label.setContentsMargins(2, 0, 0, 0)
+        v_layout.addWidget(technician_label)
+
+        # Actualizaciones del técnico
+        for update, confirmed in updates:
+            row_layout = QHBoxLayout()
+            row_layout.setContentsMargins(1, 0, 0, 0)
+            row_layout.setSpacing(5)
+
+            if confirmed:
+                btn = QPushButton("✅")
+                btn.setFixedSize(20, 20)
+                btn.setToolTip(f"{update.label} (Actualizado)")
+                btn.setEnabled(False)
+                btn.setStyleSheet("""
+                    QPushButton {
+                        background: transparent;
+                        border: none;
+                    }
+                """)
+                row_layout.addWidget(btn)
             else:
-                group = QGroupBox(f"{ws_name}{pc_label}")
-                group.setFixedSize(FIXED_WIDTH, FIXED_HEIGHT)
-                group_layout = QVBoxLayout()
-                group_layout.setContentsMargins(0, 0, 0, 0)
-                group_layout.setSpacing(0)
-                group.setLayout(group_layout)
-
-            inner_widget = QWidget()
-            v_layout = QVBoxLayout()
-            v_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-            v_layout.setContentsMargins(0, 0, 0, 0)
-            v_layout.setSpacing(0)
-            inner_widget.setLayout(v_layout)
-
-            scroll_area = QScrollArea()
-            scroll_area.setWidgetResizable(True)
-            scroll_area.setWidget(inner_widget)
-            scroll_area.setContentsMargins(0, 0, 0, 0)
-            scroll_area.setStyleSheet("QScrollArea { border-top: none; }")
-
-            group_layout.addWidget(scroll_area)
-
-            # Si no hay técnico
-            if tech_id is None:
-                if self.view_mode == "lab":
-                    no_technician = QLabel("Sin técnico")
-                    no_technician.setContentsMargins(2, 0, 0, 0)
-                    v_layout.addWidget(no_technician)
-                else:
-                    continue
-            else:
-                # Filtrado de dispositivos según formaciones
-                tech_data = queries.get_technician_trainings(self.conn, tech_id)
-                tech_manufacturers = [b for b, m, *_ in tech_data]
-                tech_models = [m for b, m, *_ in tech_data]
-
-                if filter_active:
-                    if manufacturer_filter != "Todas" and manufacturer_filter not in tech_manufacturers:
-                        continue
-                    if selected_models and not any(m in selected_models for m in tech_models):
-                        continue
-
-                # Filtrado solo pendientes usando actualizaciones según filtros
-                if self.pending_cb.isChecked():
-                    pending_updates = queries.get_latest_updates_for_technician(self.conn, tech_id)
-                    pending_filtered = [
-                        u for u in pending_updates
-                        if (manufacturer_filter == "Todas" or u[0] == manufacturer_filter)
-                        and (not selected_models or u[1] in selected_models)
-                        and not u[3]  # confirmed == False
-                    ]
-                    if len(pending_filtered) == 0:
-                        continue
-
-                num_techs += 1
-
-                # Nombre del técnico
-                technician = QLabel(f"Técnico: {tech_name}")
-                technician.setContentsMargins(2, 0, 0, 0)
-                v_layout.addWidget(technician)
-
-                # Actualizaciones del técnico
-                updates = queries.get_latest_updates_for_technician(self.conn, tech_id, limit_per_model=2)
-                for manufacturer, model, version, confirmed, update_id in updates:
-                    if selected_models and model not in selected_models:
-                        continue
-                    if manufacturer_filter != "Todas" and manufacturer != manufacturer_filter:
-                        continue
-
-                    row_layout = QHBoxLayout()
-                    row_layout.setContentsMargins(1, 0, 0, 0)
-                    row_layout.setSpacing(5)
-
-                    if confirmed:
-                        btn = QPushButton("✅")
-                        btn.setFixedSize(20, 20)
-                        btn.setToolTip(f"{manufacturer} {model}: {version} (Actualizado)")
-                        btn.setEnabled(False)
-                        btn.setStyleSheet("""
-                            QPushButton {
-                                background: transparent;
-                                border: none;
-                            }
-                        """)
-                        row_layout.addWidget(btn)
-                    else:
-                        btn = QPushButton("⏳")
-                        btn.setToolTip(f"Marcar {manufacturer} {model}: {version} como actualizado")
-                        btn.setFixedSize(20, 20)
-                        btn.clicked.connect(partial(self.mark_update, tech_id, update_id))
-                        row_layout.addWidget(btn)
-
-                    text = QLabel(f"{manufacturer} {model}: {version}")
-                    row_layout.addWidget(text)
-                    row_layout.addStretch()
-
-                    row_widget = QWidget()
-                    row_widget.setLayout(row_layout)
-                    v_layout.addWidget(row_widget)
-
-            if self.view_mode == "lab":
-                self.grid_layout.addWidget(group, pos_y, pos_x)
-            else:
-                self.grid_layout.addWidget(group, row_counter, 0)
-                row_counter += 1
+                btn = QPushButton("⏳")
+                btn.setToolTip(f"Marcar {update.label} como actualizado")
+                btn.setFixedSize(20, 20)
+                btn.clicked.connect(partial(self.mark_update, technician.id, update.id))
+                row_layout.addWidget(btn)
 
-        # Actualizar contador
-        self.tech_count_label.setText(f"Técnicos: {num_techs} / {total_techs}")
+            text = QLabel(update.label)
+            row_layout.addWidget(text)
+            row_layout.addStretch()
 
-        # Rellenar celdas vacías solo en vista grid
-        if self.view_mode == "lab":
-            for row in range(MAX_ROWS):
-                for col in range(MAX_COLS):
-                    if not self.grid_layout.itemAtPosition(row, col):
-                        placeholder = QWidget()
-                        placeholder.setFixedSize(FIXED_WIDTH, FIXED_HEIGHT)
-                        self.grid_layout.addWidget(placeholder, row, col)
+            row_widget = QWidget()
+            row_widget.setLayout(row_layout)
+            v_layout.addWidget(row_widget)
 
-        self.update_latest_updates()
-        self.update_technician_list()
+        return group
 
-    def update_latest_updates(self):
+    def update_latest_updates(self, updates):
         self.latest_updates_list.clear()
-        updates = queries.get_latest_device_updates(self.conn, limit=20)
         for manufacturer, model, version, created_at in updates:
             item_text = f"{created_at[:16]} - {manufacturer} {model}: {version}"
             self.latest_updates_list.addItem(item_text)
 
     def update_technician_list(self):
         self.technician_list.clear()
-        
-        manufacturer_filter = self.manufacturer_cb.currentText()
-        selected_models = [
-            self.model_list.item(i).text()
-            for i in range(self.model_list.count())
-            if self.model_list.item(i).checkState() == Qt.CheckState.Checked
-        ]
-        pending_only = self.pending_cb.isChecked()
-        
-        technicians = queries.get_all_technicians(self.conn)
-        for tech_id, name, created_at in technicians:
-            tech_data = queries.get_technician_trainings(self.conn, tech_id)
-            tech_manufacturers = [b for b, m, *_ in tech_data]
-            tech_models = [m for b, m, *_ in tech_data]
-
-            if manufacturer_filter != "Todas" and manufacturer_filter not in tech_manufacturers:
-                continue
-            if selected_models and not any(m in selected_models for m in tech_models):
-                continue
-            if pending_only:
-                pending_updates = queries.get_latest_updates_for_technician(self.conn, tech_id)
-                pending_filtered = [
-                    u for u in pending_updates
-                    if (manufacturer_filter == "Todas" or u[0] == manufacturer_filter)
-                    and (not selected_models or u[1] in selected_models)
-                    and not u[3]  # confirmed == False
-                ]
-                if len(pending_filtered) == 0:
-                    continue
+        self.technician_items = {}
+        if self.snapshot is None:
+            return
 
-            self.technician_list.addItem(name)
+        pending_counts = self.engine.pending_counts(self.applied_filters)
+        for tech_id in self.engine.matching_ids(self.applied_filters):
+            item = QListWidgetItem(self.snapshot.technician(tech_id).name)
+            item.setToolTip(f"Actualizaciones pendientes: {pending_counts[tech_id]}")
+            self.technician_list.addItem(item)
+            self.technician_items[tech_id] = item
 
     def mark_update(self, technician_id, update_id):
         queries.mark_update_as_confirmed(self.conn, technician_id, update_id)
-        self.update_dashboard()
+        self.after_confirmations([(technician_id, update_id)])
 
-    def export_current_dashboard(self):
+    def after_confirmations(self, pairs):
+        if self.worker.is_pending("dashboard"):
+            # El snapshot en curso puede ser anterior a esta confirmación
+            self.update_dashboard()
+            return
+        self.apply_confirmations(pairs)
+        # Las versiones confirmadas dejan de llevar a la estación del técnico
+        if self.search_text:
+            self.run_search()
+
+    def confirm_pending(self, tech_ids, manufacturer, models, description):
+        """
+        Pide confirmación y marca en una sola escritura todas las versiones sin confirmar, de todo el
+        historial y no solo las mostradas, de los dispositivos filtrados de los técnicos indicados.
+        """
+        pairs = queries.get_unconfirmed_pairs(self.conn, tech_ids, manufacturer, models)
+        if not pairs:
+            QMessageBox.information(self, "Info", f"No hay actualizaciones pendientes {description}.")
+            return
+
+        answer = QMessageBox.question(
+            self, "Confirmar actualizaciones",
+            f"¿Marcar {len(pairs)} actualizaciones sin confirmar {description} como actualizadas?"
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            queries.mark_updates_as_confirmed(self.conn, pairs)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Ocurrió un problema: {e}")
+            return
+        self.after_confirmations(pairs)
+
+    def confirm_technician(self, tech_id):
+        filters = self.applied_filters
+        self.confirm_pending([tech_id], filters.manufacturer, filters.models,
+                             f"de {self.snapshot.technician(tech_id).name}")
+
+    def confirm_model(self, model):
+        self.confirm_pending(None, self.applied_filters.manufacturer, (model,), f"del modelo {model}")
+
+    def confirm_filtered(self):
+        if self.snapshot is None:
+            return
+        filters = self.applied_filters
+        self.confirm_pending(self.engine.matching_ids(filters), filters.manufacturer, filters.models,
+                             "de los técnicos filtrados")
+
+    def show_technician_menu(self, tech_id, global_pos):
+        name = self.snapshot.technician(tech_id).name
+        menu = QMenu(self)
+        menu.addAction(f"Confirmar pendientes de {name}", partial(self.confirm_technician, tech_id))
+        menu.exec(global_pos)
+
+    def show_list_menu(self, pos):
+        index = self.list_view.indexAt(pos)
+        if index.isValid():
+            self.show_technician_menu(index.data(TechnicianIdRole), self.list_view.viewport().mapToGlobal(pos))
+
+    def show_model_menu(self, pos):
+        item = self.model_list.itemAt(pos)
+        if item is None or self.snapshot is None:
+            return
+        menu = QMenu(self)
+        menu.addAction(f"Confirmar pendientes de {item.text()}", partial(self.confirm_model, item.text()))
+        menu.exec(self.model_list.viewport().mapToGlobal(pos))
+
+    def apply_confirmations(self, pairs):
+        """
+        Marca como confirmados los pares (tech_id, update_id) en el snapshot y refresca
+        solo las celdas, filas y contadores de los técnicos afectados.
+        """
+        tech_ids = self.snapshot.confirm(pairs)
+        self.engine.confirm(pairs)
+
+        # Con muchas confirmaciones a la vez sale más barato repintar el snapshot ya actualizado
+        if len(tech_ids) > INCREMENTAL_REFRESH_LIMIT:
+            self.render_dashboard()
+            return
+
+        record = render_profiler.begin("confirmación")
+        with record.phase(PHASE_BUILD):
+            for tech_id in tech_ids:
+                self.refresh_technician(tech_id, record)
+
+        with record.phase(PHASE_SIDEBARS):
+            self.update_tech_count()
+        record.live_widgets = count_live_widgets()
+
+    def refresh_technician(self, tech_id, record=None):
+        """
+        Vuelve a pintar la celda o las filas de un técnico a partir del snapshot.
+        Si se indica record, se le suman los widgets creados y destruidos.
+        """
+        filters = self.applied_filters
+        still_visible = self.engine.technician_matches(tech_id, filters)
+
+        # Solo el filtro de pendientes puede ocultar al técnico tras una confirmación
+        if tech_id in self.technician_items:
+            if still_visible:
+                pending_count = self.engine.pending_counts(filters, [tech_id])[tech_id]
+                self.technician_items[tech_id].setToolTip(f"Actualizaciones pendientes: {pending_count}")
+            else:
+                item = self.technician_items.pop(tech_id)
+                self.technician_list.takeItem(self.technician_list.row(item))
+
+        workstation = self.visible_workstations.get(tech_id)
+        if workstation is None:
+            return
+
+        updates = filter_updates(workstation.technician, filters) if still_visible else None
+        if not still_visible:
+            del self.visible_workstations[tech_id]
+            self.num_techs -= 1
+
+        if self.view_mode == "list":
+            self.list_view.list_model.update_technician(tech_id, updates)
+            return
+
+        old_cell = self.cells.pop(tech_id)
+        if record is not None:
+            record.widgets_destroyed += count_widgets(old_cell)
+        self.grid_layout.removeWidget(old_cell)
+        old_cell.hide()
+        old_cell.deleteLater()
+
+        if still_visible:
+            cell = self.build_workstation_cell(workstation, updates)
+            self.cells[tech_id] = cell
+            self.ws_cells[workstation.id] = cell
+            if any(hit[0] == workstation.id for hit in self.search_hits):
+                cell.setStyleSheet(SEARCH_HIGHLIGHT_STYLE)
+        else:
+            del self.ws_cells[workstation.id]
+            cell = QWidget()
+            cell.setFixedSize(FIXED_WIDTH, FIXED_HEIGHT)
+        self.grid_layout.addWidget(cell, workstation.pos_y, workstation.pos_x)
+        if record is not None:
+            record.widgets_created += count_widgets(cell)
+
+    def export_current_dashboard(self, full_history=False):
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         default_name = f"dashboard_{timestamp}.xlsx"
 
-        path, _ = QFileDialog.getSaveFileName(
+        path, selected_filter = QFileDialog.getSaveFileName(
             self,
-            "Guardar Excel",
+            "Exportar",
             default_name,
-            "Archivos Excel (*.xlsx)"
+            "Archivos Excel (*.xlsx);;Archivos CSV (*.csv)"
         )
         if not path:
             return
-
-        data = []
-        manufacturer_filter = self.manufacturer_cb.currentText()
-        selected_models = [
-            self.model_list.item(i).text()
-            for i in range(self.model_list.count())
-            if self.model_list.item(i).checkState() == Qt.CheckState.Checked
-        ]
-        pending_only = self.pending_cb.isChecked()
-
-        ws_rows = queries.get_workstations_with_assignments(self.conn)
-        for ws_id, tech_id, ws_name, tech_name, pos_x, pos_y, pc_serial in ws_rows:
-            if tech_id is None:
-                continue
-
-            updates = queries.get_latest_updates_for_technician(self.conn, tech_id)
-            for manufacturer, model, version, confirmed, update_id in updates:
-                if manufacturer_filter != "Todas" and manufacturer != manufacturer_filter:
-                    continue
-                if selected_models and model not in selected_models:
-                    continue
-                if pending_only and confirmed:
-                    continue
-
-                data.append({
-                    "Workstation": ws_name,
-                    "Técnico": tech_name,
-                    "PC": pc_serial,
-                    "Fabricante": manufacturer,
-                    "Modelo": model,
-                    "Versión": version,
-                    "Actualizado": bool(confirmed)
-                })
-
-        export_path = export.export_to_excel(data, path)
-        if export_path:
-            print(f"Exportado a {export_path}")
+        if Path(path).suffix.lower() not in export.WRITERS:
+            path += ".csv" if "csv" in selected_filter else ".xlsx"
+
+        self.export_progress = QProgressDialog("Exportando...", "Cancelar", 0, 0, self)
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.setAutoReset(False)
+        self.export_progress.canceled.connect(self.cancel_export)
+
+        # Antes del primer refresco aún no hay filtros aplicados: se exporta lo que indican los controles
+        filters = self.applied_filters or self.current_filters()
+        limit_per_model = None if full_history else 2
+        self.worker.submit_with_progress("export", export_dashboard_rows, path, filters, limit_per_model)
+
+    def on_export_progress(self, key, done, total):
+        if key == "export":
+            self.export_progress.setMaximum(total)
+            self.export_progress.setValue(min(done, total))
+
+    def cancel_export(self):
+        self.worker.cancel("export")
+        self.export_progress.deleteLater()
+
+    def close_export_progress(self):
+        self.export_progress.reset()
+        self.export_progress.deleteLater()
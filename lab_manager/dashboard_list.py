@@ -0,0 +1,191 @@
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, Signal
+
+ROW_HEIGHT = 22
+ICON_SIZE = 20
+SEARCH_HIGHLIGHT_COLOR = QColor("#ffe8a3")
+
+# Tipos de fila del modelo plano
+TECHNICIAN_ROW = 0
+UPDATE_ROW = 1
+
+RowKindRole = Qt.ItemDataRole.UserRole + 1
+TechnicianIdRole = Qt.ItemDataRole.UserRole + 2
+UpdateRole = Qt.ItemDataRole.UserRole + 3
+HighlightRole = Qt.ItemDataRole.UserRole + 4
+
+
+class DashboardListModel(QAbstractListModel):
+    """
+    Modelo plano de la vista de lista: una fila por técnico seguida de una fila por actualización.
+    Las filas apuntan a los registros del snapshot; los iconos se generan al pintar las filas visibles.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._highlighted = set()
+
+    def set_entries(self, entries):
+        """
+        Recibe una lista de (tech_id, tech_name, updates), con updates como pares (Update, confirmada)
+        del snapshot, y reconstruye las filas.
+        """
+        self.beginResetModel()
+        self._rows = []
+        for tech_id, tech_name, updates in entries:
+            self._rows.append((TECHNICIAN_ROW, tech_id, tech_name))
+            for update in updates:
+                self._rows.append((UPDATE_ROW, tech_id, update))
+        self.endResetModel()
+
+    def update_technician(self, tech_id, updates):
+        """
+        Sustituye las filas de actualización de un técnico sin reconstruir el modelo.
+        Si updates es None se eliminan el técnico y sus filas.
+        """
+        first = next(
+            (i for i, row in enumerate(self._rows) if row[0] == TECHNICIAN_ROW and row[1] == tech_id),
+            None
+        )
+        if first is None:
+            return
+
+        last = first
+        while last + 1 < len(self._rows) and self._rows[last + 1][0] == UPDATE_ROW:
+            last += 1
+
+        if updates is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+            return
+
+        new_rows = [(UPDATE_ROW, tech_id, update) for update in updates]
+        if len(new_rows) == last - first:
+            self._rows[first + 1:last + 1] = new_rows
+            if new_rows:
+                self.dataChanged.emit(self.index(first + 1), self.index(last))
+            return
+
+        if last > first:
+            self.beginRemoveRows(QModelIndex(), first + 1, last)
+            del self._rows[first + 1:last + 1]
+            self.endRemoveRows()
+        if new_rows:
+            self.beginInsertRows(QModelIndex(), first + 1, first + len(new_rows))
+            self._rows[first + 1:first + 1] = new_rows
+            self.endInsertRows()
+
+    def set_highlighted(self, tech_ids):
+        """Resalta las filas de los técnicos indicados (coincidencias de la búsqueda)."""
+        self._highlighted = set(tech_ids)
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [HighlightRole])
+
+    def technician_index(self, tech_id):
+        """Índice de la fila de cabecera de un técnico, o un índice inválido si no está en la lista."""
+        for i, row in enumerate(self._rows):
+            if row[0] == TECHNICIAN_ROW and row[1] == tech_id:
+                return self.index(i)
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        kind, tech_id, payload = self._rows[index.row()]
+        if role == RowKindRole:
+            return kind
+        if role == TechnicianIdRole:
+            return tech_id
+        if role == HighlightRole:
+            return tech_id in self._highlighted
+
+        if kind == TECHNICIAN_ROW:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"Técnico: {payload}"
+            return None
+
+        update, confirmed = payload
+        if role == Qt.ItemDataRole.DisplayRole:
+            return update.label
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if confirmed:
+                return f"{update.label} (Actualizado)"
+            return f"Marcar {update.label} como actualizado"
+        if role == UpdateRole:
+            return payload
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled
+
+
+class DashboardListDelegate(QStyledItemDelegate):
+    """Pinta las filas bajo demanda y convierte los clics en ⏳ en peticiones de confirmación."""
+    confirm_requested = Signal(int, int)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def icon_rect(self, option):
+        top = option.rect.top() + (option.rect.height() - ICON_SIZE) // 2
+        return QRect(option.rect.left() + 1, top, ICON_SIZE, ICON_SIZE)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        kind = index.data(RowKindRole)
+
+        if kind == TECHNICIAN_ROW:
+            if index.data(HighlightRole):
+                painter.fillRect(option.rect, SEARCH_HIGHLIGHT_COLOR)
+            font = painter.font()
+            font.setBold(True)
+            painter.setFont(font)
+            text_rect = option.rect.adjusted(2, 0, 0, 0)
+        else:
+            _, confirmed = index.data(UpdateRole)
+            icon_rect = self.icon_rect(option)
+            if not confirmed and option.state & QStyle.StateFlag.State_MouseOver:
+                painter.fillRect(icon_rect, option.palette.midlight())
+            painter.drawText(icon_rect, Qt.AlignmentFlag.AlignCenter, "✅" if confirmed else "⏳")
+            text_rect = option.rect.adjusted(ICON_SIZE + 6, 0, 0, 0)
+
+        painter.setPen(option.palette.text().color())
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, index.data())
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and index.data(RowKindRole) == UPDATE_ROW):
+            update, confirmed = index.data(UpdateRole)
+            if not confirmed and update.id is not None and self.icon_rect(option).contains(event.position().toPoint()):
+                self.confirm_requested.emit(index.data(TechnicianIdRole), update.id)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class DashboardListView(QListView):
+    """Vista de lista virtualizada: solo se pintan las filas visibles."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+        self.list_model = DashboardListModel(self)
+        self.setModel(self.list_model)
+
+        self.delegate = DashboardListDelegate(self)
+        self.setItemDelegate(self.delegate)
@@ -0,0 +1,62 @@
+import threading
+
+from lab_manager.data import queries
+
+# Tablas de las que salen los datos de referencia; sus contadores de TableVersions invalidan la caché
+REFERENCE_TABLES = ("Devices",)
+
+
+class ReferenceCache:
+    """
+    Guarda en memoria los datos de referencia (fabricantes y modelos), que cambian pocas veces.
+    Antes de devolver un valor comprueba los contadores de TableVersions de REFERENCE_TABLES, que
+    los triggers incrementan con cualquier escritura, propia o de otra estación, en esas tablas.
+    Si alguno ha cambiado se descarta todo lo guardado y se vuelve a consultar; las escrituras en
+    otras tablas, como las confirmaciones, no afectan a la caché.
+    Se usa desde el hilo de la interfaz, con la conexión de escritura del ConnectionManager.
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self._token = None
+        self._values = {}
+
+    def _current_token(self):
+        versions = queries.get_table_versions(self.manager.writer())
+        return tuple(versions.get(table) for table in REFERENCE_TABLES)
+
+    def _get(self, key, loader):
+        token = self._current_token()
+        if token != self._token:
+            self._values.clear()
+            self._token = token
+        if key not in self._values:
+            self._values[key] = loader(self.manager.writer())
+        return list(self._values[key])
+
+    def invalidate(self):
+        """Descarta los valores guardados."""
+        self._values.clear()
+        self._token = None
+
+    def manufacturers(self):
+        return self._get("manufacturers", queries.get_manufacturers)
+
+    def models(self, manufacturer=None):
+        if manufacturer == "Todas":
+            manufacturer = None
+        return self._get(("models", manufacturer),
+                         lambda conn: queries.get_models_by_manufacturer(conn, manufacturer))
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_reference_cache(manager) -> ReferenceCache:
+    """Devuelve la ReferenceCache compartida de un ConnectionManager, creándola si hace falta."""
+    with _caches_lock:
+        cache = _caches.get(manager)
+        if cache is None:
+            cache = ReferenceCache(manager)
+            _caches[manager] = cache
+        return cache
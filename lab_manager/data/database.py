@@ -1,97 +1,557 @@
 import sqlite3
-from pathlib import Path
+import threading
+
+from lab_manager.data.versions import version_key
 
 DB_FILE = "lab_manager.db"
 
+# WAL permite leer mientras otra conexión escribe. No funciona en unidades de red que no
+# comparten memoria entre equipos; en ese caso se usa "delete" (--journal-mode delete).
+JOURNAL_MODES = ("wal", "delete")
+DEFAULT_JOURNAL_MODE = "wal"
+
+# PRAGMA de rendimiento que se aplican a cada conexión
+CONNECTION_PRAGMAS = {
+    "busy_timeout": 5000,       # ms esperando un bloqueo antes de fallar con "database is locked"
+    "synchronous": "NORMAL",    # seguro con WAL y evita un fsync por transacción
+    "cache_size": -20000,       # ~20 MB de caché de páginas
+    "mmap_size": 268435456,     # 256 MB de lectura mapeada en memoria
+    "temp_store": "MEMORY",
+}
+
+# Esquema base: el mismo que crea db_setup.py y el que ya tienen las bases de datos existentes.
+SCHEMA_V1 = """
+CREATE TABLE IF NOT EXISTS Devices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    manufacturer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS Technicians (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS Workstations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    pos_x INTEGER NOT NULL,
+    pos_y INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS PCs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    device_id INTEGER NOT NULL,
+    serial_number TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(device_id) REFERENCES Devices(id)
+);
+
+CREATE TABLE IF NOT EXISTS Assignments (
+    workstation_id INTEGER NOT NULL UNIQUE,
+    technician_id INTEGER NOT NULL UNIQUE,
+    pc_id INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (workstation_id, technician_id),
+    FOREIGN KEY(workstation_id) REFERENCES Workstations(id),
+    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
+    FOREIGN KEY(pc_id) REFERENCES PCs(id)
+);
+
+CREATE TABLE IF NOT EXISTS DeviceUpdates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    device_id INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(device_id) REFERENCES Devices(id)
+);
+
+CREATE TABLE IF NOT EXISTS TechnicianUpdateConfirmations (
+    technician_id INTEGER NOT NULL,
+    update_id INTEGER NOT NULL,
+    confirmed INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (technician_id, update_id),
+    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
+    FOREIGN KEY(update_id) REFERENCES DeviceUpdates(id)
+);
+
+CREATE TABLE IF NOT EXISTS Trainings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    technician_id INTEGER NOT NULL,
+    device_id INTEGER NOT NULL,
+    training_type TEXT, -- inicial, refuerzo
+    trainer_name TEXT,
+    competency_level TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(technician_id) REFERENCES Technicians(id),
+    FOREIGN KEY(device_id) REFERENCES Devices(id)
+);
+"""
+
+# Índices para los filtros y consultas de ventana de queries.py, restricciones de
+# unicidad y eliminación de la tabla TechnicianDevices, que no usa ninguna consulta
+# (las formaciones viven en Trainings). Antes de crear los índices únicos se fusionan
+# los duplicados que pudieran existir, reasignando sus referencias al id más bajo.
+SCHEMA_V2 = """
+DROP TABLE IF EXISTS TechnicianDevices;
+
+CREATE TEMP TABLE _device_map AS
+    SELECT d.id AS old_id,
+           (SELECT MIN(d2.id) FROM Devices d2
+            WHERE d2.manufacturer = d.manufacturer AND d2.model = d.model) AS new_id
+    FROM Devices d;
+DELETE FROM _device_map WHERE old_id = new_id;
+
+UPDATE PCs SET device_id = (SELECT new_id FROM _device_map WHERE old_id = PCs.device_id)
+WHERE device_id IN (SELECT old_id FROM _device_map);
+UPDATE Trainings SET device_id = (SELECT new_id FROM _device_map WHERE old_id = Trainings.device_id)
+WHERE device_id IN (SELECT old_id FROM _device_map);
+UPDATE DeviceUpdates SET device_id = (SELECT new_id FROM _device_map WHERE old_id = DeviceUpdates.device_id)
+WHERE device_id IN (SELECT old_id FROM _device_map);
+DELETE FROM Devices WHERE id IN (SELECT old_id FROM _device_map);
+DROP TABLE _device_map;
+
+CREATE TEMP TABLE _update_map AS
+    SELECT du.id AS old_id,
+           (SELECT MIN(du2.id) FROM DeviceUpdates du2
+            WHERE du2.device_id = du.device_id AND du2.version = du.version) AS new_id
+    FROM DeviceUpdates du;
+DELETE FROM _update_map WHERE old_id = new_id;
+
+INSERT INTO TechnicianUpdateConfirmations (technician_id, update_id, confirmed)
+    SELECT tuc.technician_id, m.new_id, MAX(tuc.confirmed)
+    FROM TechnicianUpdateConfirmations tuc
+    JOIN _update_map m ON m.old_id = tuc.update_id
+    GROUP BY tuc.technician_id, m.new_id
+    ON CONFLICT(technician_id, update_id) DO UPDATE SET confirmed = MAX(confirmed, excluded.confirmed);
+DELETE FROM TechnicianUpdateConfirmations WHERE update_id IN (SELECT old_id FROM _update_map);
+DELETE FROM DeviceUpdates WHERE id IN (SELECT old_id FROM _update_map);
+DROP TABLE _update_map;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_devices_manufacturer_model ON Devices(manufacturer, model);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_device_updates_device_version ON DeviceUpdates(device_id, version);
+CREATE INDEX IF NOT EXISTS idx_device_updates_device_id ON DeviceUpdates(device_id, id);
+CREATE INDEX IF NOT EXISTS idx_device_updates_created_at ON DeviceUpdates(created_at);
+CREATE INDEX IF NOT EXISTS idx_trainings_technician ON Trainings(technician_id, device_id);
+CREATE INDEX IF NOT EXISTS idx_confirmations_update ON TechnicianUpdateConfirmations(update_id);
+CREATE INDEX IF NOT EXISTS idx_assignments_pc ON Assignments(pc_id);
+"""
+
+# Actualizaciones pendientes (sin confirmación o con confirmed = 0) de un técnico para un dispositivo
+_PENDING_COUNT = """(
+    SELECT COUNT(*) FROM DeviceUpdates du
+    LEFT JOIN TechnicianUpdateConfirmations tuc
+        ON tuc.technician_id = {tech} AND tuc.update_id = du.id
+    WHERE du.device_id = {device} AND COALESCE(tuc.confirmed, 0) = 0
+)"""
+
+# Dispositivo de una actualización, para los triggers de confirmaciones
+_UPDATE_DEVICE = "(SELECT device_id FROM DeviceUpdates WHERE id = {update})"
+
+PENDING_SUMMARY_REBUILD = f"""
+DELETE FROM TechnicianPendingSummary;
+INSERT INTO TechnicianPendingSummary (technician_id, device_id, pending_count)
+    SELECT tr.technician_id, tr.device_id,
+           {_PENDING_COUNT.format(tech="tr.technician_id", device="tr.device_id")}
+    FROM (SELECT DISTINCT technician_id, device_id FROM Trainings) tr;
+"""
+
+# Resumen materializado de pendientes por (técnico, dispositivo formado) para la exportación de
+# pendientes, get_pending_updates_count y get_unconfirmed_pairs. Lo mantienen los triggers;
+# rebuild_pending_summary lo recalcula desde cero si alguna vez se desincroniza.
+SCHEMA_V3 = f"""
+CREATE TABLE IF NOT EXISTS TechnicianPendingSummary (
+    technician_id INTEGER NOT NULL,
+    device_id INTEGER NOT NULL,
+    pending_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (technician_id, device_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_pending_summary_device ON TechnicianPendingSummary(device_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_trainings_insert_pending AFTER INSERT ON Trainings
+BEGIN
+    INSERT OR IGNORE INTO TechnicianPendingSummary (technician_id, device_id, pending_count)
+    VALUES (NEW.technician_id, NEW.device_id,
+            {_PENDING_COUNT.format(tech="NEW.technician_id", device="NEW.device_id")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_trainings_delete_pending AFTER DELETE ON Trainings
+BEGIN
+    DELETE FROM TechnicianPendingSummary
+    WHERE technician_id = OLD.technician_id AND device_id = OLD.device_id
+      AND NOT EXISTS (SELECT 1 FROM Trainings
+                      WHERE technician_id = OLD.technician_id AND device_id = OLD.device_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_trainings_update_pending
+AFTER UPDATE OF technician_id, device_id ON Trainings
+BEGIN
+    DELETE FROM TechnicianPendingSummary
+    WHERE technician_id = OLD.technician_id AND device_id = OLD.device_id
+      AND NOT EXISTS (SELECT 1 FROM Trainings
+                      WHERE technician_id = OLD.technician_id AND device_id = OLD.device_id);
+    INSERT OR IGNORE INTO TechnicianPendingSummary (technician_id, device_id, pending_count)
+    VALUES (NEW.technician_id, NEW.device_id,
+            {_PENDING_COUNT.format(tech="NEW.technician_id", device="NEW.device_id")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_device_updates_insert_pending AFTER INSERT ON DeviceUpdates
+BEGIN
+    UPDATE TechnicianPendingSummary SET pending_count = pending_count + 1
+    WHERE device_id = NEW.device_id
+      AND NOT EXISTS (SELECT 1 FROM TechnicianUpdateConfirmations
+                      WHERE technician_id = TechnicianPendingSummary.technician_id
+                        AND update_id = NEW.id AND confirmed <> 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_device_updates_delete_pending AFTER DELETE ON DeviceUpdates
+BEGIN
+    UPDATE TechnicianPendingSummary
+    SET pending_count = {_PENDING_COUNT.format(tech="TechnicianPendingSummary.technician_id", device="OLD.device_id")}
+    WHERE device_id = OLD.device_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_device_updates_update_pending AFTER UPDATE OF device_id ON DeviceUpdates
+BEGIN
+    UPDATE TechnicianPendingSummary
+    SET pending_count = {_PENDING_COUNT.format(tech="TechnicianPendingSummary.technician_id", device="TechnicianPendingSummary.device_id")}
+    WHERE device_id IN (OLD.device_id, NEW.device_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_confirmations_insert_pending
+AFTER INSERT ON TechnicianUpdateConfirmations WHEN NEW.confirmed <> 0
+BEGIN
+    UPDATE TechnicianPendingSummary SET pending_count = pending_count - 1
+    WHERE technician_id = NEW.technician_id AND device_id = {_UPDATE_DEVICE.format(update="NEW.update_id")};
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_confirmations_delete_pending
+AFTER DELETE ON TechnicianUpdateConfirmations WHEN OLD.confirmed <> 0
+BEGIN
+    UPDATE TechnicianPendingSummary SET pending_count = pending_count + 1
+    WHERE technician_id = OLD.technician_id AND device_id = {_UPDATE_DEVICE.format(update="OLD.update_id")};
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_confirmations_update_pending
+AFTER UPDATE OF technician_id, update_id, confirmed ON TechnicianUpdateConfirmations
+BEGIN
+    UPDATE TechnicianPendingSummary SET pending_count = pending_count + 1
+    WHERE OLD.confirmed <> 0
+      AND technician_id = OLD.technician_id AND device_id = {_UPDATE_DEVICE.format(update="OLD.update_id")};
+    UPDATE TechnicianPendingSummary SET pending_count = pending_count - 1
+    WHERE NEW.confirmed <> 0
+      AND technician_id = NEW.technician_id AND device_id = {_UPDATE_DEVICE.format(update="NEW.update_id")};
+END;
+{PENDING_SUMMARY_REBUILD}"""
+
+# Tablas con contador de cambios en TableVersions, para que otras estaciones sepan qué ha cambiado
+WATCHED_TABLES = [
+    "Devices", "Technicians", "Workstations", "PCs", "Assignments",
+    "DeviceUpdates", "TechnicianUpdateConfirmations", "Trainings",
+]
+
+
+def _table_version_triggers(table):
+    return "\n".join(f"""
+CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_{event.lower()}_version AFTER {event} ON {table}
+BEGIN
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = '{table}';
+END;""" for event in ("INSERT", "UPDATE", "DELETE"))
+
+
+# Contador de modificaciones por tabla, mantenido por triggers. El ChangeWatcher lo compara
+# cuando PRAGMA data_version indica que otra conexión ha escrito.
+SCHEMA_V4 = f"""
+CREATE TABLE IF NOT EXISTS TableVersions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO TableVersions (table_name) VALUES {", ".join(f"('{t}')" for t in WATCHED_TABLES)};
+{"".join(_table_version_triggers(t) for t in WATCHED_TABLES)}
+"""
+
+# Índice de búsqueda de texto completo del dashboard. Cada entidad ocupa una fila cuyo rowid codifica
+# su tipo y su id (id * SEARCH_KIND_SLOTS + tipo), así los triggers borran y reescriben por rowid.
+# tokenchars '_.' mantiene enteros números de serie como PC_00417 y versiones como v3.2, así que se
+# encuentran por su comienzo tal como se escriben ("PC_004", "WS_2_"), no por el número suelto. Las
+# versiones se indexan como están registradas; build_search_query añade la "v" a los números.
+SEARCH_TECHNICIAN = 1
+SEARCH_WORKSTATION = 2
+SEARCH_PC = 3
+SEARCH_DEVICE = 4
+SEARCH_UPDATE = 5
+SEARCH_KIND_SLOTS = 8
+
+# (tabla, tipo, columnas que se indexan, texto indexado de la fila {row})
+SEARCH_SOURCES = [
+    ("Technicians", SEARCH_TECHNICIAN, "name", "{row}.name"),
+    ("Workstations", SEARCH_WORKSTATION, "name", "{row}.name"),
+    ("PCs", SEARCH_PC, "serial_number", "{row}.serial_number"),
+    ("Devices", SEARCH_DEVICE, "manufacturer, model", "{row}.manufacturer || ' ' || {row}.model"),
+    # Con el dispositivo delante para que "HP v3.2" (o "HP 3.2") encuentre la versión de ese fabricante
+    ("DeviceUpdates", SEARCH_UPDATE, "device_id, version",
+     "COALESCE((SELECT manufacturer || ' ' || model FROM Devices WHERE id = {row}.device_id), '')"
+     " || ' ' || {row}.version"),
+]
+
+
+def _search_rowid(kind, row):
+    return f"{row}.id * {SEARCH_KIND_SLOTS} + {kind}"
+
+
+def _search_triggers(table, kind, columns, text):
+    prefix = f"trg_{table.lower()}"
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {prefix}_insert_search AFTER INSERT ON {table}
+BEGIN
+    INSERT INTO SearchIndex (rowid, text) VALUES ({_search_rowid(kind, "NEW")}, {text.format(row="NEW")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {prefix}_update_search AFTER UPDATE OF {columns} ON {table}
+BEGIN
+    DELETE FROM SearchIndex WHERE rowid = {_search_rowid(kind, "OLD")};
+    INSERT INTO SearchIndex (rowid, text) VALUES ({_search_rowid(kind, "NEW")}, {text.format(row="NEW")});
+END;
+
+CREATE TRIGGER IF NOT EXISTS {prefix}_delete_search AFTER DELETE ON {table}
+BEGIN
+    DELETE FROM SearchIndex WHERE rowid = {_search_rowid(kind, "OLD")};
+END;"""
+
+
+_UPDATE_SEARCH_TEXT = SEARCH_SOURCES[-1][3].format(row="DeviceUpdates")
+
+SEARCH_INDEX_REBUILD = "DELETE FROM SearchIndex;\n" + "".join(
+    f"INSERT INTO SearchIndex (rowid, text) SELECT {_search_rowid(kind, table)}, {text.format(row=table)} FROM {table};\n"
+    for table, kind, _, text in SEARCH_SOURCES
+) + "INSERT INTO SearchIndex (SearchIndex) VALUES ('optimize');\n"
+
+SCHEMA_V5 = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS SearchIndex USING fts5(
+    text,
+    tokenize = "unicode61 remove_diacritics 2 tokenchars '_.'"
+);
+{"".join(_search_triggers(*source) for source in SEARCH_SOURCES)}
+
+-- El texto de las actualizaciones incluye el de su dispositivo
+CREATE TRIGGER IF NOT EXISTS trg_devices_update_search_updates AFTER UPDATE OF manufacturer, model ON Devices
+BEGIN
+    DELETE FROM SearchIndex WHERE rowid IN (
+        SELECT {_search_rowid(SEARCH_UPDATE, "DeviceUpdates")} FROM DeviceUpdates WHERE device_id = NEW.id
+    );
+    INSERT INTO SearchIndex (rowid, text)
+        SELECT {_search_rowid(SEARCH_UPDATE, "DeviceUpdates")}, {_UPDATE_SEARCH_TEXT}
+        FROM DeviceUpdates WHERE device_id = NEW.id;
+END;
+{SEARCH_INDEX_REBUILD}"""
+
+
+def migrate_version_key(conn: sqlite3.Connection):
+    """
+    Añade DeviceUpdates.version_key, la clave de ordenación de versiones.py, y la calcula para
+    las filas existentes. Las consultas de "últimas N por dispositivo" ordenan por ella con
+    idx_device_updates_version_key; el id desempata versiones equivalentes ("1.2" y "1.2.0").
+    """
+    conn.execute("ALTER TABLE DeviceUpdates ADD COLUMN version_key TEXT")
+    rows = conn.execute("SELECT id, version FROM DeviceUpdates").fetchall()
+    conn.executemany("UPDATE DeviceUpdates SET version_key = ? WHERE id = ?",
+                     ((version_key(version), update_id) for update_id, version in rows))
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_device_updates_version_key
+        ON DeviceUpdates(device_id, version_key DESC, id DESC)
+    """)
+
+
+# El registro de actualizaciones ordena por COALESCE(columna, '') para que la paginación por clave no
+# pierda las filas sin fecha; este índice mantiene sin ordenación adicional el orden por fecha.
+SCHEMA_V7 = """
+CREATE INDEX IF NOT EXISTS idx_device_updates_created_at_sort ON DeviceUpdates(COALESCE(created_at, ''));
+"""
+
+
+# Cada migración lleva la base de datos a la versión igual a su posición en la lista (empezando en 1).
+# Son scripts SQL o, si necesitan Python, funciones que reciben la conexión dentro de la transacción.
+MIGRATIONS = [
+    SCHEMA_V1,
+    SCHEMA_V2,
+    SCHEMA_V3,
+    SCHEMA_V4,
+    SCHEMA_V5,
+    migrate_version_key,
+    SCHEMA_V7,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
 def get_connection(db_path: str = DB_FILE) -> sqlite3.Connection:
     """Abre y devuelve una conexión a la base de datos SQLite."""
     conn = sqlite3.connect(db_path)
     return conn
 
+
+def configure_connection(conn: sqlite3.Connection, journal_mode: str = DEFAULT_JOURNAL_MODE):
+    """Aplica el modo de journal y los PRAGMA de CONNECTION_PRAGMAS a una conexión."""
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    for name, value in CONNECTION_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class ConnectionManager:
+    """
+    Reparte las conexiones a una base de datos: una conexión de escritura compartida,
+    pensada para el hilo de la interfaz, y una conexión de solo lectura por hilo.
+    Todas las conexiones se abren con configure_connection; al crearlo se aplican las migraciones.
+    """
+    def __init__(self, db_path: str = DB_FILE, journal_mode: str = DEFAULT_JOURNAL_MODE):
+        self.db_path = db_path
+        self.journal_mode = journal_mode
+        self._writer = None
+        self._local = threading.local()
+        self._readers = []
+        self._lock = threading.Lock()
+        init_db(db_path)
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, **kwargs)
+        configure_connection(conn, self.journal_mode)
+        return conn
+
+    def writer(self) -> sqlite3.Connection:
+        """Conexión compartida para escrituras."""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+
+    def reader(self) -> sqlite3.Connection:
+        """Conexión de solo lectura del hilo actual; se crea la primera vez que el hilo la pide."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False solo para poder cerrarla desde close_all al salir
+            conn = self._connect(check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def close_all(self):
+        """Cierra todas las conexiones. Las lecturas en curso deben haber terminado."""
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str = DB_FILE, journal_mode: str = DEFAULT_JOURNAL_MODE) -> ConnectionManager:
+    """Devuelve el ConnectionManager compartido de una base de datos, creándolo si hace falta."""
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = ConnectionManager(db_path, journal_mode)
+            _managers[db_path] = manager
+        return manager
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Devuelve la versión de esquema guardada en PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+MIGRATION_TIMEOUT = 120  # s que una estación espera a que otra termine de migrar la misma base de datos
+
+
+def _script_statements(script: str):
+    """Separa un script SQL en sentencias completas (los triggers llevan ';' dentro de BEGIN ... END)."""
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\n;"):
+                yield statement
+            statement = ""
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Aplica en orden las migraciones pendientes según PRAGMA user_version.
+    Cada migración se ejecuta en su propia transacción junto con el cambio de versión,
+    de modo que un fallo deja la base de datos en la última versión completa.
+    La transacción se abre con BEGIN IMMEDIATE y la versión se vuelve a leer dentro: si otra
+    estación arranca a la vez contra la misma base de datos, espera su bloqueo de escritura y
+    después no repite los pasos que esa estación ya ha aplicado.
+    Devuelve la versión final del esquema.
+    """
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = get_schema_version(conn)
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"La base de datos tiene la versión de esquema {version}, "
+                    f"más reciente que la soportada ({SCHEMA_VERSION})."
+                )
+            if version == SCHEMA_VERSION:
+                conn.rollback()
+                return SCHEMA_VERSION
+
+            step = MIGRATIONS[version]
+            if callable(step):
+                step(conn)
+            else:
+                for statement in _script_statements(step):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except (sqlite3.Error, RuntimeError):
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+
 def init_db(db_path: str = DB_FILE):
-    """Inicializa la base de datos si no existe."""
-    if not Path(db_path).exists():
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        
-        cur.executescript("""
-        CREATE TABLE IF NOT EXISTS Devices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            manufacturer TEXT NOT NULL,
-            model TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS Technicians (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS Workstations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            pos_x INTEGER NOT NULL,
-            pos_y INTEGER NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        );
-
-        CREATE TABLE IF NOT EXISTS PCs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            device_id INTEGER NOT NULL,
-            serial_number TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(device_id) REFERENCES Devices(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS Assignments (
-            workstation_id INTEGER NOT NULL UNIQUE,
-            technician_id INTEGER NOT NULL UNIQUE,
-            pc_id INTEGER NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (workstation_id, technician_id),
-            FOREIGN KEY(workstation_id) REFERENCES Workstations(id),
-            FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-            FOREIGN KEY(pc_id) REFERENCES PCs(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS TechnicianDevices (
-            technician_id INTEGER NOT NULL,
-            device_id INTEGER NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-            FOREIGN KEY(device_id) REFERENCES Devices(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS DeviceUpdates (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            device_id INTEGER NOT NULL,
-            version TEXT NOT NULL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(device_id) REFERENCES Devices(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS TechnicianUpdateConfirmations (
-            technician_id INTEGER NOT NULL,
-            update_id INTEGER NOT NULL,
-            confirmed INTEGER NOT NULL DEFAULT 0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (technician_id, update_id),
-            FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-            FOREIGN KEY(update_id) REFERENCES DeviceUpdates(id)
-        );
-
-        CREATE TABLE IF NOT EXISTS Trainings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            technician_id INTEGER NOT NULL,
-            device_id INTEGER NOT NULL,
-            training_type TEXT,
-            trainer_name TEXT,
-            competency_level TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(technician_id) REFERENCES Technicians(id),
-            FOREIGN KEY(device_id) REFERENCES Devices(id)
-        );
-        """)
-        conn.commit()
+    """Crea la base de datos si no existe y la actualiza a la última versión del esquema."""
+    conn = sqlite3.connect(db_path, timeout=MIGRATION_TIMEOUT)
+    try:
+        migrate(conn)
+    finally:
         conn.close()
+
+
+def _execute_in_transaction(conn: sqlite3.Connection, script: str):
+    try:
+        conn.executescript(f"BEGIN;\n{script}\nCOMMIT;")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def rebuild_pending_summary(conn: sqlite3.Connection) -> int:
+    """
+    Recalcula TechnicianPendingSummary desde cero en una transacción.
+    Devuelve el número de pares (técnico, dispositivo) del resumen.
+    """
+    _execute_in_transaction(conn, PENDING_SUMMARY_REBUILD)
+    return conn.execute("SELECT COUNT(*) FROM TechnicianPendingSummary").fetchone()[0]
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> int:
+    """
+    Recalcula SearchIndex desde cero en una transacción.
+    Devuelve el número de entradas del índice.
+    """
+    _execute_in_transaction(conn, SEARCH_INDEX_REBUILD)
+    return conn.execute("SELECT COUNT(*) FROM SearchIndex").fetchone()[0]
@@ -0,0 +1,204 @@
+"""
+Generador de datos sintéticos para pruebas de capacidad y benchmarks.
+
+Crea una base de datos nueva con el esquema de la aplicación y la rellena con datos deterministas:
+con los mismos parámetros y la misma semilla el resultado es idéntico, incluidas las fechas.
+
+    python -m lab_manager.data.generator --technicians 2000 --devices 50 --versions 20
+"""
+import argparse
+import datetime
+import random
+import sys
+from pathlib import Path
+
+from lab_manager.data.database import (DB_FILE, get_connection, init_db, rebuild_pending_summary,
+                                       rebuild_search_index)
+from lab_manager.data.versions import version_key
+
+MAX_COLS = 10  # columnas de la cuadrícula del dashboard
+
+FIRST_NAMES = [
+    "Ana", "Luis", "Marta", "Carlos", "Laura", "David", "Elena", "Javier", "Sofía", "Pablo",
+    "Isabel", "Miguel", "Carmen", "Alberto", "Lucía", "Fernando", "María", "José", "Patricia", "Antonio",
+]
+LAST_NAMES = [
+    "García", "Martínez", "López", "Sánchez", "Fernández", "Rodríguez", "Gómez", "Ruiz", "Díaz", "Moreno",
+    "Jiménez", "Torres", "Ortega", "Molina", "Castillo", "Ramos", "Alonso", "Vázquez", "Herrera", "Delgado",
+]
+SAMPLE_DEVICES = [
+    ("Apple", "MacBook Pro"), ("HP", "Spectre x360"), ("Dell", "XPS 15"),
+    ("Lenovo", "ThinkBook"), ("Asus", "ZenBook 14"), ("Acer", "Swift 3"),
+    ("MSI", "Prestige 15"),
+]
+TRAINING_TYPES = ["inicial", "refuerzo"]
+COMPETENCY_LEVELS = ["básico", "intermedio", "avanzado"]
+
+# Fecha de alta de todos los datos y de la primera actualización; las siguientes actualizaciones
+# se espacian una hora. Las fechas se fijan para que el resultado no dependa del momento de generarlo.
+BASE_DATE = datetime.datetime(2024, 1, 1, 8, 0)
+
+# PRAGMA para la carga: la base de datos es nueva, así que si algo falla basta con volver a generarla
+LOADING_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -200000,
+    "temp_store": "MEMORY",
+    "locking_mode": "EXCLUSIVE",
+}
+
+
+def device_names(count):
+    """Devuelve count pares (fabricante, modelo) únicos, empezando por los del ejemplo original."""
+    devices = []
+    for i in range(count):
+        manufacturer, model = SAMPLE_DEVICES[i % len(SAMPLE_DEVICES)]
+        if i >= len(SAMPLE_DEVICES):
+            model = f"{model} {i // len(SAMPLE_DEVICES) + 1}"
+        devices.append((manufacturer, model))
+    return devices
+
+
+def generate(db_path=DB_FILE, workstations=60, technicians=20, devices=7, versions=3,
+             confirm_ratio=0.25, max_trainings=4, seed=42):
+    """
+    Crea db_path desde cero y la rellena. Cada técnico tiene entre 1 y max_trainings formaciones,
+    cada dispositivo `versions` actualizaciones y cada par (técnico, actualización) una fila de
+    confirmación, confirmada con probabilidad confirm_ratio.
+    Devuelve el número de filas insertadas por tabla.
+    """
+    rng = random.Random(seed)
+    Path(db_path).unlink(missing_ok=True)
+    init_db(db_path)
+
+    conn = get_connection(db_path)
+    conn.isolation_level = None
+    for name, value in LOADING_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    created_at = BASE_DATE.isoformat(" ")
+    counts = {}
+    try:
+        conn.execute("BEGIN")
+        # Los triggers y los índices no únicos se recrean al final: así cada fila no dispara los
+        # triggers de resumen, búsqueda y versiones, y los índices se construyen de una vez
+        deferred = conn.execute("""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE type IN ('trigger', 'index') AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+        """).fetchall()
+        for kind, name, _ in deferred:
+            conn.execute(f"DROP {kind.upper()} {name}")
+
+        conn.executemany(
+            "INSERT INTO Workstations (id, name, pos_x, pos_y, created_at) VALUES (?, ?, ?, ?, ?)",
+            ((i + 1, f"WS_{i // MAX_COLS}_{i % MAX_COLS}", i % MAX_COLS, i // MAX_COLS, created_at)
+             for i in range(workstations))
+        )
+        counts["Workstations"] = workstations
+
+        names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(technicians)]
+        conn.executemany("INSERT INTO Technicians (id, name, created_at) VALUES (?, ?, ?)",
+                         ((i, name, created_at) for i, name in enumerate(names, start=1)))
+        counts["Technicians"] = technicians
+
+        conn.executemany(
+            "INSERT INTO Devices (id, manufacturer, model, created_at) VALUES (?, ?, ?, ?)",
+            ((i, manufacturer, model, created_at)
+             for i, (manufacturer, model) in enumerate(device_names(devices), start=1))
+        )
+        counts["Devices"] = devices
+
+        conn.executemany(
+            "INSERT INTO PCs (id, device_id, serial_number, created_at) VALUES (?, ?, ?, ?)",
+            ((i, (i - 1) % devices + 1, f"PC_{i:05}", created_at) for i in range(1, workstations + 1))
+        )
+        counts["PCs"] = workstations
+
+        ws_ids = list(range(1, workstations + 1))
+        tech_ids = list(range(1, technicians + 1))
+        rng.shuffle(ws_ids)
+        rng.shuffle(tech_ids)
+        assignments = [(ws_id, tech_id, ws_id, created_at) for tech_id, ws_id in zip(tech_ids, ws_ids)]
+        conn.executemany(
+            "INSERT INTO Assignments (workstation_id, technician_id, pc_id, created_at) VALUES (?, ?, ?, ?)",
+            assignments
+        )
+        counts["Assignments"] = len(assignments)
+
+        # Ids de actualización en orden de publicación: primero la versión 1 de todos los dispositivos, etc.
+        updates = [
+            (v * devices + d, d, f"v{v + 1}.0", version_key(f"v{v + 1}.0"),
+             (BASE_DATE + datetime.timedelta(hours=v * devices + d)).isoformat(" "))
+            for v in range(versions) for d in range(1, devices + 1)
+        ]
+        conn.executemany(
+            "INSERT INTO DeviceUpdates (id, device_id, version, version_key, created_at) VALUES (?, ?, ?, ?, ?)",
+            updates
+        )
+        counts["DeviceUpdates"] = len(updates)
+
+        # Es la tabla más grande: se rellena con INSERT ... SELECT y solo el sorteo pasa por Python.
+        # CROSS JOIN fija el orden de recorrido, de modo que el sorteo es reproducible.
+        conn.create_function("sample_confirmed", 0, lambda: int(rng.random() < confirm_ratio))
+        conn.execute("""
+            INSERT INTO TechnicianUpdateConfirmations (technician_id, update_id, confirmed, created_at)
+            SELECT t.id, du.id, sample_confirmed(), du.created_at
+            FROM Technicians t CROSS JOIN DeviceUpdates du
+            ORDER BY t.id, du.id
+        """)
+        counts["TechnicianUpdateConfirmations"] = technicians * len(updates)
+
+        trainings = []
+        for tech_id in range(1, technicians + 1):
+            for device_id in sorted(rng.sample(range(1, devices + 1), rng.randint(1, min(max_trainings, devices)))):
+                trainings.append((tech_id, device_id, rng.choice(TRAINING_TYPES), rng.choice(names),
+                                  rng.choice(COMPETENCY_LEVELS), created_at))
+        conn.executemany(
+            "INSERT INTO Trainings (technician_id, device_id, training_type, trainer_name, competency_level, "
+            "created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            trainings
+        )
+        counts["Trainings"] = len(trainings)
+
+        for _, _, sql in deferred:
+            conn.execute(sql)
+        conn.execute("UPDATE TableVersions SET version = version + 1")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        conn.close()
+        raise
+
+    rebuild_pending_summary(conn)
+    rebuild_search_index(conn)
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="lab_manager.data.generator",
+                                     description="Genera una base de datos sintética de Lab Manager")
+    parser.add_argument("--db", default=DB_FILE, help=f"base de datos a crear; se sobrescribe (por defecto {DB_FILE})")
+    parser.add_argument("--workstations", type=int, default=60)
+    parser.add_argument("--technicians", type=int, default=20)
+    parser.add_argument("--devices", type=int, default=7)
+    parser.add_argument("--versions", type=int, default=3, help="actualizaciones por dispositivo")
+    parser.add_argument("--confirm-ratio", type=float, default=0.25, help="fracción de confirmaciones confirmadas")
+    parser.add_argument("--max-trainings", type=int, default=4, help="formaciones máximas por técnico")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    counts = generate(args.db, args.workstations, args.technicians, args.devices, args.versions,
+                      args.confirm_ratio, args.max_trainings, args.seed)
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Instrumentación opcional de las consultas.
+
+Las funciones de queries.py llevan el decorador timed. Mientras la instrumentación está desactivada
+solo cuesta comprobar un indicador; al activarla (enable, --trace-sql o el diálogo de Diagnóstico)
+cada llamada se mide y se acumulan llamadas, tiempo total, p95 y máximo por función. Las sentencias
+que lanza cada llamada se capturan con set_trace_callback, que solo está instalado en la conexión
+mientras dura alguna llamada medida; si la llamada supera el umbral se guarda y se registra en el
+log "lab_manager.sql" junto con su EXPLAIN QUERY PLAN.
+"""
+import functools
+import inspect
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+SLOW_QUERY_MS = 100.0
+MAX_SAMPLES = 1000  # muestras por consulta para calcular el p95
+MAX_SLOW_QUERIES = 50
+MAX_EXPLAINED_STATEMENTS = 20  # por llamada lenta; un executemany puede lanzar miles
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+logger = logging.getLogger("lab_manager.sql")
+
+_enabled = False
+_threshold_ms = SLOW_QUERY_MS
+_lock = threading.Lock()
+_stats = {}
+_slow_queries = deque(maxlen=MAX_SLOW_QUERIES)
+_local = threading.local()
+
+
+class _QueryStat:
+    __slots__ = ("count", "total_ms", "max_ms", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.samples.append(ms)
+
+
+def enable(threshold_ms=SLOW_QUERY_MS):
+    """Activa la instrumentación; las llamadas de más de threshold_ms se consideran lentas."""
+    global _enabled, _threshold_ms
+    _threshold_ms = threshold_ms
+    _enabled = True
+
+
+def disable():
+    """
+    Desactiva la instrumentación. Las llamadas medidas que estén en curso quitan su trace callback
+    al terminar, así que después ninguna conexión queda con él instalado.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Descarta las estadísticas y las consultas lentas acumuladas."""
+    with _lock:
+        _stats.clear()
+        _slow_queries.clear()
+
+
+def percentile(samples, fraction):
+    """Percentil por rango más cercano; 0 si no hay muestras."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def get_stats():
+    """Devuelve las estadísticas por consulta, ordenadas por tiempo total descendente."""
+    with _lock:
+        rows = [
+            {
+                "name": name,
+                "count": stat.count,
+                "total_ms": round(stat.total_ms, 3),
+                "mean_ms": round(stat.total_ms / stat.count, 3),
+                "p95_ms": round(percentile(stat.samples, 0.95), 3),
+                "max_ms": round(stat.max_ms, 3),
+            }
+            for name, stat in _stats.items()
+        ]
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def get_slow_queries():
+    """Devuelve las últimas llamadas lentas, de la más reciente a la más antigua."""
+    with _lock:
+        return list(reversed(_slow_queries))
+
+
+def _trace(sql):
+    for statements in getattr(_local, "stack", ()):
+        statements.append(sql)
+
+
+def explain(conn, sql):
+    """EXPLAIN QUERY PLAN de sql como lista de líneas; vacía si la sentencia no se puede explicar."""
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    except Exception:
+        return []
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def _record(name, conn, statements, ms):
+    with _lock:
+        _stats.setdefault(name, _QueryStat()).add(ms)
+    if ms < _threshold_ms:
+        return
+
+    explained = []
+    for sql in dict.fromkeys(statements):
+        # Se omiten BEGIN/COMMIT y las sentencias de triggers, que llegan como comentarios "--"
+        if sql.lstrip()[:6].upper().startswith(EXPLAINABLE):
+            explained.append({"sql": sql, "plan": explain(conn, sql)})
+            if len(explained) == MAX_EXPLAINED_STATEMENTS:
+                break
+    with _lock:
+        _slow_queries.append({"name": name, "ms": round(ms, 3), "at": time.strftime("%H:%M:%S"),
+                              "statements": explained})
+    logger.warning(
+        "Consulta lenta %s: %.1f ms\n%s", name, ms,
+        "\n".join(f"{entry['sql']}\n  " + "\n  ".join(entry["plan"]) for entry in explained)
+    )
+
+
+def _begin(conn):
+    statements = []
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+        _local.depths = {}
+    # El trace callback se instala en la primera llamada medida sobre la conexión y se quita en _end
+    # al terminar la última, para que fuera de ellas las sentencias no pasen por Python
+    depth = _local.depths.get(conn, 0)
+    if depth == 0:
+        conn.set_trace_callback(_trace)
+    _local.depths[conn] = depth + 1
+    stack.append(statements)
+    return statements, time.perf_counter()
+
+
+def _end(name, conn, statements, start):
+    ms = (time.perf_counter() - start) * 1000
+    stack = _local.stack
+    for i in range(len(stack) - 1, -1, -1):
+        if stack[i] is statements:
+            del stack[i]
+            break
+    depth = _local.depths.pop(conn) - 1
+    if depth:
+        _local.depths[conn] = depth
+    else:
+        conn.set_trace_callback(None)
+    _record(name, conn, statements, ms)
+
+
+def timed(func):
+    """
+    Mide cada llamada a una función de consulta cuyo primer argumento es la conexión.
+    En los generadores se mide el recorrido completo, no solo su creación.
+    """
+    name = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(conn, *args, **kwargs):
+            if not _enabled:
+                yield from func(conn, *args, **kwargs)
+                return
+            statements, start = _begin(conn)
+            try:
+                yield from func(conn, *args, **kwargs)
+            finally:
+                _end(name, conn, statements, start)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(conn, *args, **kwargs):
+        if not _enabled:
+            return func(conn, *args, **kwargs)
+        statements, start = _begin(conn)
+        try:
+            return func(conn, *args, **kwargs)
+        finally:
+            _end(name, conn, statements, start)
+    return wrapper
@@ -1,10 +1,18 @@
 import sqlite3
 
+from lab_manager.data.database import (SEARCH_KIND_SLOTS, SEARCH_TECHNICIAN, SEARCH_WORKSTATION, SEARCH_PC,
+                                       SEARCH_DEVICE, SEARCH_UPDATE)
+from lab_manager.data.instrumentation import timed
+from lab_manager.data.snapshot import build_snapshot
+from lab_manager.data.versions import normalize_version, version_key
+
+@timed
 def get_manufacturers(conn):
     c = conn.cursor()
     c.execute("SELECT DISTINCT manufacturer FROM Devices ORDER BY manufacturer")
     return [row[0] for row in c.fetchall()]
 
+@timed
 def get_models_by_manufacturer(conn, manufacturer=None):
     c = conn.cursor()
     if manufacturer is None or manufacturer == "Todas":
@@ -13,11 +21,13 @@ def get_models_by_manufacturer(conn, manufacturer=None):
         c.execute("SELECT DISTINCT model FROM Devices WHERE manufacturer=?", (manufacturer,))
     return [row[0] for row in c.fetchall()]
 
+@timed
 def get_all_technicians(conn):
     c = conn.cursor()
     c.execute("SELECT id, name, created_at FROM Technicians;")
     return c.fetchall()
 
+@timed
 def get_total_technicians(conn):
     c = conn.cursor()
     c.execute("""
@@ -27,6 +37,7 @@ def get_total_technicians(conn):
     """)
     return c.fetchone()[0]
 
+@timed
 def get_workstations_with_assignments(conn):
     c = conn.cursor()
     c.execute("""
@@ -38,6 +49,7 @@ def get_workstations_with_assignments(conn):
     """)
     return c.fetchall()
 
+@timed
 def get_technician_devices(conn, tech_id):
     """Devuelve los dispositivos en los que el técnico tiene formación"""
     c = conn.cursor()
@@ -49,15 +61,53 @@ def get_technician_devices(conn, tech_id):
     """, (tech_id,))
     return c.fetchall()
 
-def get_pending_updates_count(conn, tech_id, manufacturer=None, models=None):
+# Versión confirmada más alta de cada (técnico, dispositivo) con pendientes, para el modo de sustitución
+# (supersede): confirmar una versión da por confirmadas las anteriores del mismo dispositivo. Los pares
+# sin pendientes no hacen falta, y para cada par se recorre idx_device_updates_version_key de la más
+# reciente hacia atrás hasta la primera confirmada, en lugar de agrupar todas las confirmaciones.
+_CONFIRMED_MAX_CTE = """confirmed_max AS MATERIALIZED (
+        SELECT s.technician_id, s.device_id, (
+            SELECT du.version_key
+            FROM DeviceUpdates du
+            JOIN TechnicianUpdateConfirmations tuc
+                ON tuc.technician_id = s.technician_id AND tuc.update_id = du.id
+            WHERE du.device_id = s.device_id AND tuc.confirmed <> 0
+            ORDER BY du.version_key DESC
+            LIMIT 1
+        ) AS version_key
+        FROM TechnicianPendingSummary s
+        WHERE s.pending_count > 0{condition}
+    )"""
+
+def _confirmed_sql(supersede, technician_condition=""):
+    """
+    Piezas SQL del estado confirmado de una fila con alias t (Trainings), d, du y tuc:
+    (cláusula WITH, JOIN, expresión). Sin supersede es la confirmación de la propia actualización;
+    con supersede también cuenta como confirmada si el técnico ha confirmado una versión igual o
+    posterior del mismo dispositivo. technician_condition restringe el WITH (p. ej. a un técnico).
+    """
+    if not supersede:
+        return "", "", "COALESCE(tuc.confirmed, 0)"
+    return (
+        "WITH " + _CONFIRMED_MAX_CTE.format(condition=technician_condition),
+        "LEFT JOIN confirmed_max cm ON cm.technician_id = t.technician_id AND cm.device_id = d.id",
+        "CASE WHEN COALESCE(tuc.confirmed, 0) <> 0 OR du.version_key <= cm.version_key THEN 1 ELSE 0 END",
+    )
+
+@timed
+def get_pending_updates_count(conn, tech_id, manufacturer=None, models=None, supersede=False):
+    """
+    Cuenta las actualizaciones pendientes del técnico a partir de TechnicianPendingSummary.
+    Con supersede no cuentan las anteriores a la versión más alta que haya confirmado.
+    """
+    if supersede:
+        return _get_superseded_pending_count(conn, tech_id, manufacturer, models)
+
     sql = """
-        SELECT COUNT(*)
-        FROM Trainings tr
-        JOIN DeviceUpdates du ON tr.device_id = du.device_id
-        LEFT JOIN TechnicianUpdateConfirmations tuc
-            ON tuc.technician_id = tr.technician_id AND tuc.update_id = du.id
-        JOIN Devices d ON tr.device_id = d.id
-        WHERE tr.technician_id = ? AND COALESCE(tuc.confirmed,0)=0
+        SELECT COALESCE(SUM(s.pending_count), 0)
+        FROM TechnicianPendingSummary s
+        JOIN Devices d ON s.device_id = d.id
+        WHERE s.technician_id = ?
     """
     params = [tech_id]
     conditions = []
@@ -75,40 +125,199 @@ def get_pending_updates_count(conn, tech_id, manufacturer=None, models=None):
     c.execute(sql, params)
     return c.fetchone()[0]
 
+def _get_superseded_pending_count(conn, tech_id, manufacturer=None, models=None):
+    with_clause, confirmed_join, confirmed = _confirmed_sql(True, " AND s.technician_id = ?")
+    conditions, params = _device_conditions(manufacturer, models)
+    conditions.append(f"{confirmed} = 0")
+    c = conn.cursor()
+    c.execute(f"""
+        {with_clause}
+        SELECT COUNT(*)
+        FROM (SELECT DISTINCT technician_id, device_id FROM Trainings WHERE technician_id = ?) t
+        JOIN Devices d ON t.device_id = d.id
+        JOIN DeviceUpdates du ON du.device_id = d.id
+        LEFT JOIN TechnicianUpdateConfirmations tuc
+            ON tuc.technician_id = t.technician_id AND tuc.update_id = du.id
+        {confirmed_join}
+        WHERE {" AND ".join(conditions)}
+    """, [tech_id, tech_id] + params)
+    return c.fetchone()[0]
+
+@timed
+def get_lab_stats(conn):
+    """Devuelve un resumen del laboratorio como diccionario nombre -> valor."""
+    c = conn.cursor()
+    c.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM Workstations),
+            (SELECT COUNT(*) FROM Technicians),
+            (SELECT COUNT(*) FROM Assignments),
+            (SELECT COUNT(*) FROM Devices),
+            (SELECT COUNT(*) FROM DeviceUpdates),
+            (SELECT COUNT(*) FROM TechnicianUpdateConfirmations WHERE confirmed <> 0),
+            (SELECT COALESCE(SUM(pending_count), 0) FROM TechnicianPendingSummary)
+    """)
+    keys = ["workstations", "technicians", "assigned_technicians", "devices",
+            "device_updates", "confirmed_updates", "pending_updates"]
+    return dict(zip(keys, c.fetchone()))
+
+@timed
+def get_table_versions(conn):
+    """Devuelve el contador de modificaciones de cada tabla vigilada como diccionario tabla -> versión."""
+    c = conn.cursor()
+    c.execute("SELECT table_name, version FROM TableVersions")
+    return dict(c.fetchall())
+
+@timed
 def get_updates_for_technician(conn, tech_id):
     c = conn.cursor()
     c.execute("""
         SELECT d.manufacturer, d.model, du.version,
             COALESCE(tuc.confirmed, 0) AS confirmed, du.id AS update_id
-        FROM Trainings tr
+        FROM (SELECT DISTINCT technician_id, device_id FROM Trainings WHERE technician_id = ?) tr
         JOIN Devices d ON tr.device_id = d.id
         LEFT JOIN DeviceUpdates du ON d.id = du.device_id
         LEFT JOIN TechnicianUpdateConfirmations tuc
             ON tuc.technician_id = tr.technician_id AND tuc.update_id = du.id
-        WHERE tr.technician_id = ?
-        ORDER BY du.id DESC
+        ORDER BY du.version_key DESC, du.id DESC
     """, (tech_id,))
     return c.fetchall()
 
+def _latest_updates_join(limit_per_model):
+    """
+    LEFT JOIN de las limit_per_model versiones más recientes de cada dispositivo d (todas si es None).
+    La subconsulta lee solo esas entradas de idx_device_updates_version_key, en lugar de numerar
+    todo el historial con ROW_NUMBER y descartar el resto.
+    """
+    if limit_per_model is None:
+        return "LEFT JOIN DeviceUpdates du ON du.device_id = d.id", []
+    return """LEFT JOIN DeviceUpdates du ON du.id IN (
+                SELECT id FROM DeviceUpdates WHERE device_id = d.id
+                ORDER BY version_key DESC, id DESC
+                LIMIT ?)""", [limit_per_model]
+
+@timed
 def get_latest_updates_for_technician(conn, tech_id, limit_per_model=2):
+    updates_join, params = _latest_updates_join(limit_per_model)
     c = conn.cursor()
     c.execute(f"""
-        SELECT manufacturer, model, version, confirmed, update_id FROM (
-            SELECT d.manufacturer, d.model, du.version,
-                   COALESCE(tuc.confirmed, 0) AS confirmed,
-                   du.id AS update_id,
-                   ROW_NUMBER() OVER(PARTITION BY d.id ORDER BY du.id DESC) AS rn
-            FROM Trainings t
-            JOIN Devices d ON t.device_id = d.id
-            LEFT JOIN DeviceUpdates du ON d.id = du.device_id
-            LEFT JOIN TechnicianUpdateConfirmations tuc
-                ON tuc.technician_id = t.technician_id AND tuc.update_id = du.id
-            WHERE t.technician_id = ?
-        ) WHERE rn <= ?
-    """, (tech_id, limit_per_model))
+        SELECT d.manufacturer, d.model, du.version,
+               COALESCE(tuc.confirmed, 0) AS confirmed,
+               du.id AS update_id
+        FROM (SELECT DISTINCT technician_id, device_id FROM Trainings WHERE technician_id = ?) t
+        JOIN Devices d ON t.device_id = d.id
+        {updates_join}
+        LEFT JOIN TechnicianUpdateConfirmations tuc
+            ON tuc.technician_id = t.technician_id AND tuc.update_id = du.id
+        ORDER BY d.id, du.version_key DESC, du.id DESC
+    """, [tech_id] + params)
     return c.fetchall()
 
+@timed
+def get_dashboard_snapshot(conn, limit_per_model=2, supersede=False):
+    """
+    Devuelve el estado completo del dashboard como un Snapshot (ver lab_manager.data.snapshot),
+    leído con consultas de conjunto. Cada técnico lleva sus formaciones, las últimas
+    limit_per_model versiones de cada dispositivo en el que está formado con su estado de
+    confirmación.
+    Con supersede el estado confirmado se calcula en modo de sustitución (ver _confirmed_sql).
+    """
+    # Cada consulta tiene su cursor y build_snapshot las recorre sin cargar todas las filas en memoria
+    workstations = get_workstations_with_assignments(conn)
+
+    trainings = conn.execute("""
+        SELECT tech.id, tech.name,
+               d.id, d.manufacturer, d.model, t.training_type, t.trainer_name, t.competency_level
+        FROM Technicians tech
+        LEFT JOIN Trainings t ON t.technician_id = tech.id
+        LEFT JOIN Devices d ON t.device_id = d.id
+        ORDER BY tech.id
+    """)
+
+    updates_join, params = _latest_updates_join(limit_per_model)
+    with_clause, confirmed_join, confirmed = _confirmed_sql(supersede)
+    updates = conn.execute(f"""
+        {with_clause}
+        SELECT t.technician_id, d.id, d.manufacturer, d.model,
+               du.id AS update_id, du.version,
+               {confirmed} AS confirmed
+        FROM (SELECT DISTINCT technician_id, device_id FROM Trainings) t
+        JOIN Devices d ON t.device_id = d.id
+        {updates_join}
+        LEFT JOIN TechnicianUpdateConfirmations tuc
+            ON tuc.technician_id = t.technician_id AND tuc.update_id = du.id
+        {confirmed_join}
+        ORDER BY t.technician_id, d.id, du.version_key DESC, du.id DESC
+    """, params)
+
+    return build_snapshot(workstations, trainings, updates, supersede)
+
+def _dashboard_rows_sql(manufacturer=None, models=None, pending_only=False, limit_per_model=2, supersede=False):
+    """Construye la consulta de filas (estación, técnico, actualización) con los filtros del dashboard."""
+    with_clause, confirmed_join, confirmed = _confirmed_sql(supersede)
+    updates_join, params = _latest_updates_join(limit_per_model)
+    conditions, device_params = _device_conditions(manufacturer, models)
+    params.extend(device_params)
+    if pending_only:
+        # Descarta de entrada los dispositivos sin pendientes, salvo los que no tienen versiones, que
+        # cuentan como pendientes igual que en el dashboard; el límite por dispositivo se aplica antes
+        # de quitar las confirmadas
+        conditions.append("""(du.id IS NULL OR EXISTS (
+            SELECT 1 FROM TechnicianPendingSummary s
+            WHERE s.technician_id = t.technician_id AND s.device_id = d.id AND s.pending_count > 0))""")
+        conditions.append(f"{confirmed} = 0")
+
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    sql = f"""
+        {with_clause}
+        SELECT w.name AS ws_name, tech.name AS tech_name, p.serial_number AS pc_serial,
+               d.manufacturer, d.model, du.version,
+               {confirmed} AS confirmed
+        FROM Assignments a
+        JOIN Workstations w ON w.id = a.workstation_id
+        JOIN Technicians tech ON tech.id = a.technician_id
+        LEFT JOIN PCs p ON p.id = a.pc_id
+        JOIN (SELECT DISTINCT technician_id, device_id FROM Trainings) t ON t.technician_id = a.technician_id
+        JOIN Devices d ON t.device_id = d.id
+        {updates_join}
+        LEFT JOIN TechnicianUpdateConfirmations tuc
+            ON tuc.technician_id = t.technician_id AND tuc.update_id = du.id
+        {confirmed_join}
+        {where}
+        ORDER BY w.id, d.id, du.version_key DESC, du.id DESC
+    """
+    return sql, params
+
+@timed
+def count_dashboard_rows(conn, manufacturer=None, models=None, pending_only=False, limit_per_model=2,
+                         supersede=False):
+    """Cuenta las filas que devolvería iter_dashboard_rows con los mismos filtros."""
+    sql, params = _dashboard_rows_sql(manufacturer, models, pending_only, limit_per_model, supersede)
+    c = conn.cursor()
+    c.execute(f"SELECT COUNT(*) FROM ({sql})", params)
+    return c.fetchone()[0]
+
+@timed
+def iter_dashboard_rows(conn, manufacturer=None, models=None, pending_only=False, limit_per_model=2,
+                        supersede=False):
+    """
+    Recorre las filas (workstation, técnico, PC, fabricante, modelo, versión, confirmado) de los técnicos
+    asignados directamente desde el cursor, sin cargarlas en memoria.
+    Con limit_per_model=None se incluye todo el historial de actualizaciones y con supersede una
+    versión confirmada da por confirmadas las anteriores del mismo dispositivo.
+    """
+    sql, params = _dashboard_rows_sql(manufacturer, models, pending_only, limit_per_model, supersede)
+    c = conn.cursor()
+    c.execute(sql, params)
+    yield from c
+
+@timed
 def get_latest_device_updates(conn, limit=20):
+    """
+    Últimas actualizaciones registradas, de todos los dispositivos, para la barra lateral. Se ordenan
+    a propósito por fecha de registro y no por version_key: la lista muestra lo último que se ha
+    dado de alta, y version_key solo ordena versiones de un mismo dispositivo.
+    """
     c = conn.cursor()
     c.execute("""
         SELECT d.manufacturer, d.model, du.version, du.created_at
@@ -119,6 +328,194 @@ def get_latest_device_updates(conn, limit=20):
     """, (limit,))
     return c.fetchall()
 
+# Columnas por las que se puede ordenar el registro de actualizaciones
+REGISTER_SORT_COLUMNS = {
+    "manufacturer": "d.manufacturer",
+    "model": "d.model",
+    "version": "du.version_key",
+    "created_at": "du.created_at",
+}
+
+def _device_conditions(manufacturer=None, models=None):
+    conditions = []
+    params = []
+    if manufacturer and manufacturer != "Todas":
+        conditions.append("d.manufacturer = ?")
+        params.append(manufacturer)
+    if models:
+        placeholders = ",".join("?"*len(models))
+        conditions.append(f"d.model IN ({placeholders})")
+        params.extend(models)
+    return conditions, params
+
+@timed
+def get_device_updates_page(conn, sort="created_at", descending=True, after=None, limit=200,
+                            manufacturer=None, models=None):
+    """
+    Devuelve una página del registro de actualizaciones con paginación por clave (keyset).
+    after es (valor de la columna de orden, id) de la última fila de la página anterior, de modo
+    que cada página cuesta lo mismo sin importar cuántas se hayan leído antes.
+    Cada fila es (manufacturer, model, version, created_at, update_id, version_key); el orden
+    "version" usa version_key, así que after lleva la clave y no el texto de la versión.
+    Se ordena por COALESCE(columna, ''): con NULL la comparación por clave nunca se cumpliría y
+    las filas sin valor (p. ej. sin fecha) se perderían; el valor de after se normaliza igual.
+    """
+    key = f"COALESCE({REGISTER_SORT_COLUMNS[sort]}, '')"
+    direction = "DESC" if descending else "ASC"
+    conditions, params = _device_conditions(manufacturer, models)
+    if after is not None:
+        value, update_id = after
+        value = "" if value is None else value
+        # La primera comparación, redundante, permite a SQLite empezar a leer el índice en ese punto
+        conditions.append(f"{key} {'<=' if descending else '>='} ?")
+        conditions.append(f"({key}, du.id) {'<' if descending else '>'} (?, ?)")
+        params.extend((value, value, update_id))
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    params.append(limit)
+
+    c = conn.cursor()
+    c.execute(f"""
+        SELECT d.manufacturer, d.model, du.version, du.created_at, du.id, du.version_key
+        FROM DeviceUpdates du
+        JOIN Devices d ON du.device_id = d.id
+        {where}
+        ORDER BY {key} {direction}, du.id {direction}
+        LIMIT ?
+    """, params)
+    return c.fetchall()
+
+@timed
+def count_device_updates(conn, manufacturer=None, models=None):
+    """Cuenta las actualizaciones del registro con los mismos filtros que get_device_updates_page."""
+    conditions, params = _device_conditions(manufacturer, models)
+    where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+    c = conn.cursor()
+    c.execute(f"""
+        SELECT COUNT(*)
+        FROM DeviceUpdates du
+        JOIN Devices d ON du.device_id = d.id
+        {where}
+    """, params)
+    return c.fetchone()[0]
+
+SEARCH_LIMIT = 200  # entradas del índice que se resuelven a estaciones por búsqueda
+
+def build_search_query(text):
+    """
+    Convierte el texto del buscador en una consulta MATCH de FTS5: cada palabra es un prefijo
+    y deben aparecer todas. Una palabra que empieza por un número se busca también en la forma
+    con la que se registran las versiones ("3.2" encuentra "v3.2"). Devuelve None si no queda
+    ninguna palabra.
+    """
+    terms = []
+    for term in text.split():
+        term = term.replace('"', '')
+        if not term:
+            continue
+        if term[0].isdigit():
+            terms.append(f'("{term}"* OR "{normalize_version(term)}"*)')
+        else:
+            terms.append(f'"{term}"*')
+    # AND explícito: FTS5 no admite el AND implícito delante de un grupo entre paréntesis
+    return " AND ".join(terms) or None
+
+@timed
+def search_workstations(conn, text, limit=SEARCH_LIMIT):
+    """
+    Busca text en SearchIndex y devuelve las estaciones afectadas como (ws_id, tech_id), de la
+    coincidencia más relevante a la menos. Un técnico, puesto o PC lleva a su estación; un
+    dispositivo, a las de los técnicos formados en él; una versión, a las de los técnicos formados
+    que aún no la han confirmado.
+    """
+    match = build_search_query(text)
+    if match is None:
+        return []
+    # CROSS JOIN fija el orden: de las pocas coincidencias hacia las asignaciones, y no al revés
+    c = conn.cursor()
+    c.execute(f"""
+        WITH hits AS (
+            SELECT rowid / {SEARCH_KIND_SLOTS} AS ref_id, rowid % {SEARCH_KIND_SLOTS} AS kind, rank
+            FROM SearchIndex
+            WHERE SearchIndex MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ),
+        matches AS (
+            SELECT a.workstation_id AS ws_id, a.technician_id AS tech_id, h.rank
+            FROM hits h JOIN Assignments a ON a.technician_id = h.ref_id
+            WHERE h.kind = {SEARCH_TECHNICIAN}
+            UNION ALL
+            SELECT w.id, a.technician_id, h.rank
+            FROM hits h
+            JOIN Workstations w ON w.id = h.ref_id
+            LEFT JOIN Assignments a ON a.workstation_id = w.id
+            WHERE h.kind = {SEARCH_WORKSTATION}
+            UNION ALL
+            SELECT a.workstation_id, a.technician_id, h.rank
+            FROM hits h JOIN Assignments a ON a.pc_id = h.ref_id
+            WHERE h.kind = {SEARCH_PC}
+            UNION ALL
+            SELECT a.workstation_id, a.technician_id, h.rank
+            FROM hits h
+            CROSS JOIN TechnicianPendingSummary s ON s.device_id = h.ref_id
+            CROSS JOIN Assignments a ON a.technician_id = s.technician_id
+            WHERE h.kind = {SEARCH_DEVICE}
+            UNION ALL
+            SELECT a.workstation_id, a.technician_id, h.rank
+            FROM hits h
+            CROSS JOIN DeviceUpdates du ON du.id = h.ref_id
+            CROSS JOIN TechnicianPendingSummary s ON s.device_id = du.device_id AND s.pending_count > 0
+            CROSS JOIN Assignments a ON a.technician_id = s.technician_id
+            WHERE h.kind = {SEARCH_UPDATE}
+              AND NOT EXISTS (SELECT 1 FROM TechnicianUpdateConfirmations tuc
+                              WHERE tuc.technician_id = s.technician_id AND tuc.update_id = du.id
+                                AND tuc.confirmed <> 0)
+        )
+        SELECT ws_id, tech_id
+        FROM matches
+        GROUP BY ws_id, tech_id
+        ORDER BY MIN(rank), ws_id
+    """, (match, limit))
+    return c.fetchall()
+
+UNCONFIRMED_TECHNICIANS_PER_QUERY = 500  # por debajo del límite de parámetros de SQLite
+
+@timed
+def get_unconfirmed_pairs(conn, tech_ids=None, manufacturer=None, models=None):
+    """
+    Pares (technician_id, update_id) de todas las versiones sin confirmar, en todo el historial, de los
+    dispositivos en los que están formados los técnicos de tech_ids (todos si es None), con los filtros
+    de marca y modelo. Solo recorre los dispositivos con pendientes en TechnicianPendingSummary.
+    """
+    conditions, device_params = _device_conditions(manufacturer, models)
+    conditions.append("s.pending_count > 0")
+    conditions.append("COALESCE(tuc.confirmed, 0) = 0")
+    sql = """
+        SELECT s.technician_id, du.id
+        FROM TechnicianPendingSummary s
+        JOIN Devices d ON d.id = s.device_id
+        JOIN DeviceUpdates du ON du.device_id = s.device_id
+        LEFT JOIN TechnicianUpdateConfirmations tuc
+            ON tuc.technician_id = s.technician_id AND tuc.update_id = du.id
+        WHERE {where}
+        ORDER BY s.technician_id, du.id
+    """
+    c = conn.cursor()
+    if tech_ids is None:
+        c.execute(sql.format(where=" AND ".join(conditions)), device_params)
+        return c.fetchall()
+
+    tech_ids = list(tech_ids)
+    pairs = []
+    for start in range(0, len(tech_ids), UNCONFIRMED_TECHNICIANS_PER_QUERY):
+        chunk = tech_ids[start:start + UNCONFIRMED_TECHNICIANS_PER_QUERY]
+        placeholders = ",".join("?" * len(chunk))
+        where = " AND ".join([f"s.technician_id IN ({placeholders})"] + conditions)
+        c.execute(sql.format(where=where), chunk + device_params)
+        pairs.extend(c.fetchall())
+    return pairs
+
+@timed
 def mark_update_as_confirmed(conn, technician_id, update_id):
     c = conn.cursor()
     c.execute("""
@@ -128,6 +525,24 @@ def mark_update_as_confirmed(conn, technician_id, update_id):
     """, (technician_id, update_id))
     conn.commit()
 
+@timed
+def mark_updates_as_confirmed(conn, pairs):
+    """
+    Confirma muchos pares (technician_id, update_id) con un único executemany en una sola transacción.
+    Devuelve el número de pares escritos.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return 0
+    with conn:
+        conn.executemany("""
+            INSERT INTO TechnicianUpdateConfirmations (technician_id, update_id, confirmed)
+            VALUES (?, ?, 1)
+            ON CONFLICT(technician_id, update_id) DO UPDATE SET confirmed=1
+        """, pairs)
+    return len(pairs)
+
+@timed
 def get_technician_trainings(conn, tech_id):
     """
     Devuelve una lista de dispositivos en los que el técnico tiene formaciones.
@@ -142,28 +557,53 @@ def get_technician_trainings(conn, tech_id):
     """, (tech_id,))
     return c.fetchall()
 
-def add_device_update(conn, manufacturer, model, version):
+@timed
+def add_device_updates(conn, entries):
+    """
+    Registra varias versiones a la vez. entries es una lista de (manufacturer, model, version).
+    Los dispositivos se resuelven con una sola consulta y las filas se insertan con INSERT OR IGNORE
+    sobre la clave única (device_id, version) en una sola transacción.
+    Devuelve (nuevas, duplicadas): las nuevas con el formato de get_latest_device_updates
+    y las duplicadas como las tuplas de entrada.
+    """
+    entries = list(dict.fromkeys(entries))
+    if not entries:
+        return [], []
+
     c = conn.cursor()
+    devices = list(dict.fromkeys((manufacturer, model) for manufacturer, model, _ in entries))
+    placeholders = ",".join("(?, ?)" for _ in devices)
     c.execute(
-        "SELECT id FROM Devices WHERE manufacturer=? AND model=?",
-        (manufacturer, model)
+        f"SELECT manufacturer, model, id FROM Devices WHERE (manufacturer, model) IN (VALUES {placeholders})",
+        [value for device in devices for value in device]
     )
-    row = c.fetchone()
-    if not row:
-        raise ValueError(f"Dispositivo no encontrado: {manufacturer} {model}")
+    device_ids = {(manufacturer, model): device_id for manufacturer, model, device_id in c.fetchall()}
+    for manufacturer, model in devices:
+        if (manufacturer, model) not in device_ids:
+            raise ValueError(f"Dispositivo no encontrado: {manufacturer} {model}")
 
-    device_id = row[0]
+    new_ids = {}
+    duplicates = []
+    with conn:
+        for manufacturer, model, version in entries:
+            c.execute(
+                "INSERT OR IGNORE INTO DeviceUpdates (device_id, version, version_key) VALUES (?, ?, ?)",
+                (device_ids[(manufacturer, model)], version, version_key(version))
+            )
+            if c.rowcount:
+                new_ids[c.lastrowid] = (manufacturer, model, version)
+            else:
+                duplicates.append((manufacturer, model, version))
 
-    c.execute(
-        "SELECT 1 FROM DeviceUpdates WHERE device_id=? AND version=?",
-        (device_id, version)
-    )
-    if c.fetchone():
-        return False
+    added = []
+    if new_ids:
+        placeholders = ",".join("?"*len(new_ids))
+        c.execute(f"SELECT id, created_at FROM DeviceUpdates WHERE id IN ({placeholders})", list(new_ids))
+        created = dict(c.fetchall())
+        added = [(*new_ids[update_id], created[update_id]) for update_id in new_ids]
+    return added, duplicates
 
-    c.execute(
-        "INSERT INTO DeviceUpdates (device_id, version) VALUES (?, ?)",
-        (device_id, version)
-    )
-    conn.commit()
-    return True
+@timed
+def add_device_update(conn, manufacturer, model, version):
+    added, _ = add_device_updates(conn, [(manufacturer, model, version)])
+    return bool(added)
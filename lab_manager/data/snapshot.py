@@ -0,0 +1,173 @@
+"""
+Snapshot del estado del laboratorio que comparten las vistas del dashboard.
+
+get_dashboard_snapshot lo construye una vez por refresco con build_snapshot. Los registros usan
+__slots__ y no se copian entre técnicos: cada dispositivo y cada versión es un único objeto
+(con su texto ya formateado) al que apuntan todos los técnicos formados en él, y el estado de
+confirmación de un técnico es un bytearray alineado con sus versiones. Las vistas solo lo leen;
+las confirmaciones se aplican con Snapshot.confirm.
+"""
+
+
+class Device:
+    __slots__ = ("id", "index", "manufacturer", "model", "label")
+
+    def __init__(self, device_id, manufacturer, model):
+        self.id = device_id
+        self.index = None  # posición en Snapshot.devices
+        self.manufacturer = manufacturer
+        self.model = model
+        self.label = f"{manufacturer} {model}"
+
+
+class Update:
+    """Versión de un dispositivo. Los dispositivos sin versiones llevan una con id y version None."""
+    __slots__ = ("id", "index", "device", "version", "label")
+
+    def __init__(self, update_id, device, version):
+        self.id = update_id
+        self.index = None  # posición en Snapshot.updates; None en las versiones vacías
+        self.device = device
+        self.version = version
+        self.label = f"{device.label}: {version}"
+
+
+class Training:
+    __slots__ = ("device", "training_type", "trainer_name", "competency_level")
+
+    def __init__(self, device, training_type, trainer_name, competency_level):
+        self.device = device
+        self.training_type = training_type
+        self.trainer_name = trainer_name
+        self.competency_level = competency_level
+
+
+class Technician:
+    """
+    Técnico con sus formaciones y las últimas versiones de sus dispositivos (agrupadas por
+    dispositivo, de la más reciente a la más antigua). confirmed[i] indica si ha confirmado
+    updates[i].
+    """
+    __slots__ = ("id", "name", "trainings", "updates", "confirmed")
+
+    def __init__(self, tech_id, name):
+        self.id = tech_id
+        self.name = name
+        self.trainings = []
+        self.updates = []
+        self.confirmed = bytearray()
+
+    def update_states(self):
+        """Pares (Update, confirmada) en el orden del snapshot."""
+        return zip(self.updates, self.confirmed)
+
+
+class Workstation:
+    __slots__ = ("id", "name", "technician", "pos_x", "pos_y", "pc_serial")
+
+    def __init__(self, ws_id, name, technician, pos_x, pos_y, pc_serial):
+        self.id = ws_id
+        self.name = name
+        self.technician = technician  # None si no hay técnico asignado
+        self.pos_x = pos_x
+        self.pos_y = pos_y
+        self.pc_serial = pc_serial
+
+
+class Snapshot:
+    """
+    Estado completo del dashboard. devices, updates y technicians son listas con sus mapas
+    id -> posición; updates está agrupada por dispositivo y ordenada de la versión más reciente
+    a la más antigua. supersede indica si el estado confirmado se calculó en modo de sustitución.
+    """
+    __slots__ = ("workstations", "technicians", "devices", "updates", "supersede",
+                 "technician_index", "device_index", "update_index")
+
+    def __init__(self, workstations, technicians, devices, updates, supersede):
+        self.workstations = workstations
+        self.technicians = technicians
+        self.devices = devices
+        self.updates = updates
+        self.supersede = supersede
+        self.technician_index = {technician.id: i for i, technician in enumerate(technicians)}
+        self.device_index = {device.id: i for i, device in enumerate(devices)}
+        self.update_index = {update.id: i for i, update in enumerate(updates)}
+
+    def technician(self, tech_id):
+        return self.technicians[self.technician_index[tech_id]]
+
+    def confirm(self, pairs):
+        """
+        Marca como confirmados los pares (tech_id, update_id); con supersede también las versiones
+        anteriores del mismo dispositivo. Devuelve los ids de los técnicos afectados.
+        """
+        update_ids_by_tech = {}
+        for tech_id, update_id in pairs:
+            if tech_id in self.technician_index:
+                update_ids_by_tech.setdefault(tech_id, set()).add(update_id)
+
+        for tech_id, update_ids in update_ids_by_tech.items():
+            technician = self.technician(tech_id)
+            confirmed_devices = set()
+            for i, update in enumerate(technician.updates):
+                if update.id in update_ids or (self.supersede and update.device in confirmed_devices):
+                    technician.confirmed[i] = 1
+                if self.supersede and technician.confirmed[i]:
+                    confirmed_devices.add(update.device)
+        return list(update_ids_by_tech)
+
+
+def build_snapshot(workstation_rows, training_rows, update_rows, supersede=False):
+    """
+    Construye el Snapshot a partir de las filas de get_dashboard_snapshot:
+      - workstation_rows: (ws_id, tech_id, ws_name, tech_name, pos_x, pos_y, pc_serial).
+      - training_rows: (tech_id, tech_name, device_id, manufacturer, model, training_type,
+        trainer_name, competency_level), con device_id None si el técnico no tiene formaciones.
+      - update_rows: (tech_id, device_id, manufacturer, model, update_id, version, confirmed),
+        ordenadas por técnico, dispositivo y versión descendente.
+    """
+    technicians = {}
+    devices = {}
+    for tech_id, tech_name, device_id, manufacturer, model, *training in training_rows:
+        technician = technicians.get(tech_id)
+        if technician is None:
+            technician = technicians[tech_id] = Technician(tech_id, tech_name)
+        if device_id is not None:
+            device = devices.get(device_id)
+            if device is None:
+                device = devices[device_id] = Device(device_id, manufacturer, model)
+            technician.trainings.append(Training(device, *training))
+
+    device_updates = {}  # device_id -> {update_id: Update}, de la versión más reciente a la más antigua
+    for tech_id, device_id, manufacturer, model, update_id, version, confirmed in update_rows:
+        technician = technicians.get(tech_id)
+        if technician is None:
+            continue
+        device = devices.get(device_id)
+        if device is None:
+            device = devices[device_id] = Device(device_id, manufacturer, model)
+        updates = device_updates.setdefault(device_id, {})
+        update = updates.get(update_id)
+        if update is None:
+            update = updates[update_id] = Update(update_id, device, version)
+        technician.updates.append(update)
+        technician.confirmed.append(1 if confirmed else 0)
+
+    for technician in technicians.values():
+        technician.trainings = tuple(technician.trainings)
+        technician.updates = tuple(technician.updates)
+
+    device_list = sorted(devices.values(), key=lambda device: device.id)
+    update_list = []
+    for i, device in enumerate(device_list):
+        device.index = i
+        for update in device_updates.get(device.id, {}).values():
+            if update.id is not None:
+                update.index = len(update_list)
+                update_list.append(update)
+
+    workstations = [
+        Workstation(ws_id, ws_name, technicians.get(tech_id), pos_x, pos_y, pc_serial)
+        for ws_id, tech_id, ws_name, tech_name, pos_x, pos_y, pc_serial in workstation_rows
+    ]
+    return Snapshot(workstations, list(technicians.values()), device_list, update_list, supersede)
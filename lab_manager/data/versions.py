@@ -0,0 +1,52 @@
+"""
+Versiones de firmware y software de los dispositivos.
+
+Las versiones se guardan como texto libre ("v3.2", "3.10.1", "v2.0-rc1"), que no se puede ordenar
+directamente: como texto "v10.0" va antes que "v9.0". version_key las convierte en una clave de
+texto que sí ordena bien y que se guarda en DeviceUpdates.version_key para que SQLite pueda
+ordenar por versión con un índice.
+"""
+import re
+
+FIELD_WIDTH = 10  # dígitos con los que se rellena cada número de la clave
+
+_PREFIX = re.compile(r"^v(?:ersi[oó]n)?\.?\s*", re.IGNORECASE)
+_NUMBERS = re.compile(r"(\d+(?:\.\d+)*)(.*)")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_version(text):
+    """
+    Forma canónica con la que se registra una versión: "v" seguido del número, sin espacios.
+    "3.2", "V3.2" y "versión 3.2" quedan como "v3.2". Devuelve "" si no queda nada.
+    """
+    version = _PREFIX.sub("", text.strip())
+    version = re.sub(r"\s+", "-", version)
+    return f"v{version}" if version else ""
+
+
+def _pad(number):
+    return number.zfill(FIELD_WIDTH)
+
+
+def version_key(text):
+    """
+    Clave de ordenación de una versión. Los números se comparan como números ("v10.0" > "v9.0"),
+    los ceros finales no cuentan ("1.2" == "1.2.0") y una versión con sufijo ("2.0-rc1") va antes
+    que la versión final ("2.0"). Las versiones sin número van antes que todas las demás.
+    """
+    version = _PREFIX.sub("", text.strip().lower())
+    match = _NUMBERS.match(version)
+    if match is None:
+        return "!" + version
+
+    numbers = [int(part) for part in match.group(1).split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    key = ".".join(_pad(str(number)) for number in numbers)
+
+    # El espacio ordena antes que "." (1.2 < 1.2.1) y "-" antes que "~" (2.0-rc1 < 2.0)
+    suffix = match.group(2).strip(" -_.+")
+    if not suffix:
+        return key + " ~"
+    return key + " -" + _DIGITS.sub(lambda digits: _pad(digits.group()), suffix)
@@ -0,0 +1,137 @@
+from PySide6.QtWidgets import (QDialog, QTableView, QVBoxLayout, QHBoxLayout, QTabWidget, QPushButton,
+                               QCheckBox, QPlainTextEdit, QHeaderView, QFileDialog, QMessageBox)
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt
+
+from lab_manager.data import instrumentation
+from lab_manager.profiling import render_profiler, PHASES
+
+STATS_COLUMNS = [
+    ("name", "Consulta"), ("count", "Llamadas"), ("total_ms", "Total (ms)"),
+    ("mean_ms", "Media (ms)"), ("p95_ms", "p95 (ms)"), ("max_ms", "Máx (ms)"),
+]
+
+RENDER_COLUMNS = (
+    [("at", "Hora"), ("kind", "Refresco"), ("total_ms", "Total (ms)")]
+    + [(phase, f"{phase.capitalize()} (ms)") for phase in PHASES]
+    + [("widgets_created", "Creados"), ("widgets_destroyed", "Destruidos"), ("live_widgets", "Vivos")]
+)
+
+
+def numeric_item(value):
+    """Celda que ordena por valor numérico y no por texto."""
+    item = QStandardItem(f"{value:.3f}" if isinstance(value, float) else str(value))
+    item.setData(value, Qt.ItemDataRole.UserRole)
+    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+class DiagnosticsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico")
+        self.resize(854, 480)
+
+        self.enabled_cb = QCheckBox(
+            f"Medir las consultas (se registran las que tardan más de {instrumentation.SLOW_QUERY_MS:.0f} ms)"
+        )
+        self.enabled_cb.setChecked(instrumentation.is_enabled())
+        self.enabled_cb.toggled.connect(self.set_enabled)
+
+        self.count_widgets_cb = QCheckBox("Contar widgets en cada refresco")
+        self.count_widgets_cb.setChecked(render_profiler.count_widgets)
+        self.count_widgets_cb.toggled.connect(self.set_count_widgets)
+
+        self.stats_model = QStandardItemModel()
+        self.stats_model.setHorizontalHeaderLabels([title for _, title in STATS_COLUMNS])
+        self.stats_model.setSortRole(Qt.ItemDataRole.UserRole)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
+        self.stats_table.setSortingEnabled(True)
+        self.stats_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        self.slow_queries_text = QPlainTextEdit()
+        self.slow_queries_text.setReadOnly(True)
+        self.slow_queries_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        self.render_model = QStandardItemModel()
+        self.render_model.setHorizontalHeaderLabels([title for _, title in RENDER_COLUMNS])
+        self.render_table = QTableView()
+        self.render_table.setModel(self.render_model)
+        self.render_table.setEditTriggers(QTableView.NoEditTriggers)
+
+        self.tab_layout = QTabWidget()
+        self.tab_layout.addTab(self.stats_table, "Consultas")
+        self.tab_layout.addTab(self.slow_queries_text, "Consultas lentas")
+        self.tab_layout.addTab(self.render_table, "Renderizado")
+
+        self.refresh_button = QPushButton("Actualizar")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.reset_button = QPushButton("Reiniciar")
+        self.reset_button.clicked.connect(self.reset)
+        self.export_button = QPushButton("Exportar renderizado")
+        self.export_button.clicked.connect(self.export_render_profile)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.enabled_cb)
+        button_layout.addWidget(self.count_widgets_cb)
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
+        button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.refresh_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(button_layout)
+        main_layout.addWidget(self.tab_layout)
+        self.setLayout(main_layout)
+
+        self.refresh()
+
+    def set_enabled(self, enabled):
+        if enabled:
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+
+    def set_count_widgets(self, enabled):
+        render_profiler.count_widgets = enabled
+
+    def reset(self):
+        instrumentation.reset()
+        render_profiler.clear()
+        self.refresh()
+
+    def export_render_profile(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar renderizado", "renderizado.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            render_profiler.export_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el fichero: {e}")
+
+    def refresh(self):
+        self.stats_model.removeRows(0, self.stats_model.rowCount())
+        for row in instrumentation.get_stats():
+            items = [QStandardItem(row["name"])] + [numeric_item(row[key]) for key, _ in STATS_COLUMNS[1:]]
+            items[0].setData(row["name"], Qt.ItemDataRole.UserRole)
+            self.stats_model.appendRow(items)
+
+        lines = []
+        for entry in instrumentation.get_slow_queries():
+            lines.append(f"[{entry['at']}] {entry['name']}: {entry['ms']:.1f} ms")
+            for statement in entry["statements"]:
+                lines.append(f"    {statement['sql'].strip()}")
+                lines.extend(f"        {line}" for line in statement["plan"])
+            lines.append("")
+        self.slow_queries_text.setPlainText("\n".join(lines) or "No hay consultas lentas registradas.")
+
+        # Refrescos del dashboard, del más reciente al más antiguo
+        self.render_model.removeRows(0, self.render_model.rowCount())
+        for record in reversed(render_profiler.as_dict()["records"]):
+            values = {**record, **record["phases_ms"]}
+            items = [QStandardItem(record["at"]), QStandardItem(record["kind"])]
+            items += [numeric_item(values.get(key, 0.0)) for key, _ in RENDER_COLUMNS[2:]]
+            self.render_model.appendRow(items)
+        self.render_table.resizeColumnsToContents()
@@ -0,0 +1,122 @@
+"""
+Motor de filtrado del dashboard.
+
+FilterEngine carga una vez las formaciones y el estado de confirmación del Snapshot en matrices
+booleanas de NumPy, cuyas filas y columnas siguen los mapas de id a índice del propio snapshot:
+  - trained: técnico × dispositivo, formaciones.
+  - pending: técnico × actualización, versiones del snapshot pendientes para el técnico.
+
+Los filtros de marca, modelo y pendientes y los contadores de pendientes por técnico se resuelven
+con operaciones vectoriales sobre columnas, y las confirmaciones se aplican sobre las matrices sin
+reconstruirlas. Las actualizaciones se guardan agrupadas por dispositivo y
+de la versión más reciente a la más antigua, como en el snapshot.
+"""
+import numpy as np
+
+from lab_manager.filters import ALL_MANUFACTURERS
+
+
+def _coordinates(pairs):
+    """Listas (filas, columnas) como índices de NumPy; también cuando están vacías."""
+    return tuple(np.array(positions, dtype=np.intp) for positions in pairs)
+
+
+class FilterEngine:
+    def __init__(self, snapshot):
+        self.supersede = snapshot.supersede
+        # Filas, columnas y mapas id -> índice son los del snapshot
+        self.tech_index = snapshot.technician_index
+        self.update_index = snapshot.update_index
+        self._tech_ids = np.array([technician.id for technician in snapshot.technicians], dtype=object)
+        self._update_ids = np.array([update.id for update in snapshot.updates], dtype=object)
+
+        self.device_manufacturers = np.array([device.manufacturer for device in snapshot.devices], dtype=object)
+        self.device_models = np.array([device.model for device in snapshot.devices], dtype=object)
+        self.update_devices = np.array([update.device.index for update in snapshot.updates], dtype=np.intp)
+        # Fin del grupo de cada columna: las columnas j + 1 .. group_end[j] - 1 son versiones anteriores
+        counts = np.bincount(self.update_devices, minlength=len(snapshot.devices))
+        self.group_end = np.cumsum(counts)[self.update_devices]
+        self.device_has_updates = counts > 0
+
+        # Las matrices se rellenan de una vez a partir de listas de coordenadas
+        trained, pending = ([], []), ([], [])
+        for i, technician in enumerate(snapshot.technicians):
+            for training in technician.trainings:
+                trained[0].append(i)
+                trained[1].append(training.device.index)
+            for update, confirmed in technician.update_states():
+                if update.index is not None and not confirmed:
+                    pending[0].append(i)
+                    pending[1].append(update.index)
+
+        self.trained = np.zeros((len(snapshot.technicians), len(snapshot.devices)), dtype=bool)
+        self.trained[_coordinates(trained)] = True
+        self.pending = np.zeros((len(snapshot.technicians), len(snapshot.updates)), dtype=bool)
+        self.pending[_coordinates(pending)] = True
+
+    def _device_masks(self, filters):
+        """Máscaras de dispositivo del filtro de marca y del de modelos."""
+        if filters.manufacturer == ALL_MANUFACTURERS:
+            manufacturer_mask = np.ones(len(self.device_manufacturers), dtype=bool)
+        else:
+            manufacturer_mask = self.device_manufacturers == filters.manufacturer
+        if filters.models:
+            model_mask = np.isin(self.device_models, list(filters.models))
+        else:
+            model_mask = np.ones(len(self.device_models), dtype=bool)
+        return manufacturer_mask, model_mask
+
+    def _rows(self, tech_ids):
+        if tech_ids is None:
+            return np.arange(len(self._tech_ids))
+        return np.array([self.tech_index[tech_id] for tech_id in tech_ids if tech_id in self.tech_index],
+                        dtype=np.intp)
+
+    def matches(self, filters, tech_ids=None):
+        """
+        Máscara de los técnicos (todos o los de tech_ids, en ese orden) que pasan los filtros de
+        marca, modelo y pendientes.
+        """
+        rows = self._rows(tech_ids)
+        manufacturer_mask, model_mask = self._device_masks(filters)
+        result = np.ones(len(rows), dtype=bool)
+        trained = self.trained[rows]
+        if filters.manufacturer != ALL_MANUFACTURERS:
+            result &= trained[:, manufacturer_mask].any(axis=1)
+        if filters.models:
+            result &= trained[:, model_mask].any(axis=1)
+        if filters.pending_only:
+            device_mask = manufacturer_mask & model_mask
+            # Un dispositivo sin versiones registradas cuenta como pendiente, igual que en la exportación;
+            # los demás, si tienen alguna de sus últimas versiones pendiente
+            result &= (self.pending[rows][:, device_mask[self.update_devices]].any(axis=1)
+                       | trained[:, device_mask & ~self.device_has_updates].any(axis=1))
+        return result
+
+    def matching_ids(self, filters):
+        """Ids de los técnicos que pasan los filtros, en el orden del snapshot."""
+        return self._tech_ids[self.matches(filters)].tolist()
+
+    def technician_matches(self, tech_id, filters):
+        return bool(self.matches(filters, [tech_id]).any())
+
+    def pending_counts(self, filters, tech_ids=None):
+        """
+        tech_id -> número de versiones del snapshot pendientes en los dispositivos filtrados, para
+        todos los técnicos o los de tech_ids.
+        """
+        rows = self._rows(tech_ids)
+        manufacturer_mask, model_mask = self._device_masks(filters)
+        columns = (manufacturer_mask & model_mask)[self.update_devices]
+        counts = self.pending[rows][:, columns].sum(axis=1)
+        return dict(zip(self._tech_ids[rows].tolist(), counts.tolist()))
+
+    def confirm(self, pairs):
+        """Marca como confirmados los pares (tech_id, update_id); con supersede, también las versiones anteriores."""
+        for tech_id, update_id in pairs:
+            i = self.tech_index.get(tech_id)
+            j = self.update_index.get(update_id)
+            if i is None or j is None:
+                continue
+            end = self.group_end[j] if self.supersede else j + 1
+            self.pending[i, j:end] = False
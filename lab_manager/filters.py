@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+ALL_MANUFACTURERS = "Todas"
+
+
+@dataclass(frozen=True)
+class FilterState:
+    """Filtros del dashboard. Es inmutable para poder compararlo entre refrescos."""
+    manufacturer: str = ALL_MANUFACTURERS
+    models: tuple = ()
+    pending_only: bool = False
+    supersede: bool = False  # una versión confirmada da por confirmadas las anteriores del dispositivo
+
+    @property
+    def active(self):
+        """Indica si hay filtro de marca o de modelo."""
+        return self.manufacturer != ALL_MANUFACTURERS or len(self.models) > 0
+
+
+def filter_updates(technician, filters):
+    """
+    Filtra las versiones de un técnico del snapshot según la marca y los modelos seleccionados.
+    Devuelve pares (Update, confirmada).
+    """
+    return [
+        (update, confirmed) for update, confirmed in technician.update_states()
+        if (filters.manufacturer == ALL_MANUFACTURERS or update.device.manufacturer == filters.manufacturer)
+        and (not filters.models or update.device.model in filters.models)
+    ]
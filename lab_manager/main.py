@@ -1,19 +1,23 @@
 from PySide6.QtWidgets import QMainWindow, QMessageBox
 from PySide6.QtGui import QAction
 
-from lab_manager.data.database import get_connection
+from lab_manager.data.database import get_manager
+from lab_manager.data.cache import get_reference_cache
 from lab_manager.dashboard import Dashboard
 from lab_manager.updates import UpdatesDialog
+from lab_manager.diagnostics import DiagnosticsDialog
 
 class MainWindow(QMainWindow):
-    def __init__(self, parent=None):
+    def __init__(self, manager=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Lab Manager")
         self.resize(960, 540)
 
-        self.conn = get_connection()
+        self.manager = manager or get_manager()
+        self.conn = self.manager.writer()
+        self.cache = get_reference_cache(self.manager)
 
-        self._dashboard_widget = Dashboard()
+        self._dashboard_widget = Dashboard(self.manager)
         self.setCentralWidget(self._dashboard_widget)
 
         self.create_actions()
@@ -24,6 +28,8 @@ class MainWindow(QMainWindow):
 
         self._open_updates_act = QAction("&Actualizaciones", self, triggered=self.open_updates_dialog)
 
+        self._open_diagnostics_act = QAction("&Diagnóstico", self, triggered=self.open_diagnostics_dialog)
+
         self._about_act = QAction("&Acerca de Lab Manager", self, triggered=self.open_about)
 
     def create_menus(self):
@@ -33,12 +39,28 @@ class MainWindow(QMainWindow):
 
         self._file_menu = self.menuBar().addMenu("&Herramientas")
         self._file_menu.addAction(self._open_updates_act)
+        self._file_menu.addAction(self._open_diagnostics_act)
 
         self._help_menu = self.menuBar().addMenu("&Ayuda")
         self._help_menu.addAction(self._about_act)
 
+    def closeEvent(self, event):
+        # Interrumpe las consultas en segundo plano para no esperar a que terminen al salir
+        self._dashboard_widget.watcher.stop()
+        self._dashboard_widget.worker.cancel_all()
+        self._dashboard_widget.worker.pool.waitForDone()
+        self.manager.close_all()
+        super().closeEvent(event)
+
     def open_updates_dialog(self):
-        dialog = UpdatesDialog(self.conn, self)
+        dialog = UpdatesDialog(self.conn, self.cache, self)
+        dialog.exec()
+        # Las escrituras propias no cambian PRAGMA data_version: el watcher no las ve
+        if dialog.added_updates:
+            self._dashboard_widget.on_tables_changed({"DeviceUpdates"})
+
+    def open_diagnostics_dialog(self):
+        dialog = DiagnosticsDialog(self)
         dialog.exec()
 
     def open_about(self):
@@ -0,0 +1,108 @@
+"""
+Perfil de los refrescos del dashboard.
+
+Cada refresco crea un RenderRecord con la duración de sus fases y los widgets creados, destruidos
+y vivos al terminar. render_profiler guarda los últimos MAX_RECORDS refrescos de la sesión; se
+consultan en Herramientas > Diagnóstico y se pueden exportar como JSON para analizar sesiones
+reales en los equipos de los operadores. Medir las fases cuesta unas pocas llamadas a perf_counter
+por refresco, así que está siempre activo. Contar widgets recorre el árbol de widgets y crece con
+su número, así que solo se hace con count_widgets activado, desde Diagnóstico o con la variable
+de entorno LAB_MANAGER_COUNT_WIDGETS=1; si no, los recuentos quedan a 0.
+"""
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from lab_manager.data.instrumentation import percentile
+
+MAX_RECORDS = 200
+COUNT_WIDGETS_ENV = "LAB_MANAGER_COUNT_WIDGETS"
+
+PHASE_QUERY = "consulta"
+PHASE_FILTER = "filtro"
+PHASE_BUILD = "construcción"
+PHASE_LAYOUT = "layout"
+PHASE_SIDEBARS = "barras laterales"
+PHASES = [PHASE_QUERY, PHASE_FILTER, PHASE_BUILD, PHASE_LAYOUT, PHASE_SIDEBARS]
+
+
+class RenderRecord:
+    """Medidas de un refresco: duración por fase en ms y recuento de widgets."""
+    __slots__ = ("kind", "at", "phases", "widgets_created", "widgets_destroyed", "live_widgets")
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.at = time.strftime("%H:%M:%S")
+        self.phases = {}
+        self.widgets_created = 0
+        self.widgets_destroyed = 0
+        self.live_widgets = 0
+
+    def add(self, name, ms):
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    @property
+    def total_ms(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "at": self.at,
+            "total_ms": round(self.total_ms, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "widgets_created": self.widgets_created,
+            "widgets_destroyed": self.widgets_destroyed,
+            "live_widgets": self.live_widgets,
+        }
+
+
+class RenderProfiler:
+    def __init__(self, max_records=MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self.count_widgets = os.environ.get(COUNT_WIDGETS_ENV, "") not in ("", "0")
+
+    def begin(self, kind):
+        """Empieza el registro de un refresco del tipo indicado."""
+        record = RenderRecord(kind)
+        self.records.append(record)
+        return record
+
+    def clear(self):
+        self.records.clear()
+
+    def summary(self):
+        """Media, p95 y máximo de cada fase por tipo de refresco."""
+        samples = {}
+        for record in self.records:
+            for name, ms in list(record.phases.items()) + [("total", record.total_ms)]:
+                samples.setdefault((record.kind, name), []).append(ms)
+        return [
+            {
+                "kind": kind, "phase": name, "count": len(values),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p95_ms": round(percentile(values, 0.95), 3),
+                "max_ms": round(max(values), 3),
+            }
+            for (kind, name), values in samples.items()
+        ]
+
+    def as_dict(self):
+        return {"records": [record.as_dict() for record in self.records], "summary": self.summary()}
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+
+
+render_profiler = RenderProfiler()
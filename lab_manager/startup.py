@@ -0,0 +1,57 @@
+import json
+import sys
+import time
+
+# Dependencias pesadas que no deberían estar cargadas antes de la primera ventana
+HEAVY_MODULES = ["pandas", "openpyxl", "numpy"]
+
+
+class StartupTimer:
+    """Registra la duración de cada fase del arranque hasta el primer pintado de la ventana."""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def as_dict(self):
+        return {
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases},
+            "first_paint_ms": round((self.last - self.start) * 1000, 1),
+            "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+        }
+
+    def report(self, destination="-"):
+        """Escribe el informe en stderr (destination "-") o como JSON en el fichero indicado."""
+        data = self.as_dict()
+        if destination != "-":
+            with open(destination, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            return
+
+        print("Arranque de Lab Manager:", file=sys.stderr)
+        for name, ms in data["phases_ms"].items():
+            print(f"  {name:<20} {ms:>8.1f} ms", file=sys.stderr)
+        print(f"  {'primer pintado':<20} {data['first_paint_ms']:>8.1f} ms", file=sys.stderr)
+        loaded = ", ".join(data["heavy_modules_loaded"]) or "ninguno"
+        print(f"  módulos pesados cargados: {loaded}", file=sys.stderr)
+
+
+def watch_first_paint(widget, callback):
+    """Llama a callback() una sola vez, justo después de que widget termine su primer pintado."""
+    from PySide6.QtCore import QObject, QEvent, QTimer
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                obj.removeEventFilter(self)
+                QTimer.singleShot(0, callback)
+            return False
+
+    paint_filter = _FirstPaintFilter(widget)
+    widget.installEventFilter(paint_filter)
+    return paint_filter
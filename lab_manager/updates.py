@@ -1,41 +1,66 @@
 from PySide6.QtWidgets import (QDialog, QTableView, QVBoxLayout, QTabWidget, QWidget, QLineEdit,
                                QGridLayout, QLabel, QComboBox, QListWidget, QListWidgetItem,
                                QPushButton, QMessageBox, QHBoxLayout)
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QIntValidator
+from PySide6.QtGui import QIntValidator
 from PySide6.QtCore import Qt
 
 from lab_manager.data import queries
+from lab_manager.data.versions import normalize_version
+from lab_manager.updates_model import DeviceUpdatesTableModel, COLUMNS
 
 class UpdatesDialog(QDialog):
-    def __init__(self, conn, parent = None,):
+    def __init__(self, conn, cache, parent = None,):
         super().__init__(parent)
         self.setWindowTitle("Actualizaciones")
         self.setFixedSize(854, 480)
 
-        self.conn = conn        
+        self.conn = conn
+        self.cache = cache
+        self.added_updates = False
 
-        self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(["Fabricante", "Modelo", "Versión", "Fecha"])
+        # Registro completo, cargado por páginas al desplazarse. La etiqueta del total tiene que existir
+        # antes de activar la ordenación, que reinicia el modelo y actualiza el total
+        self.register_count_label = QLabel()
+        self.model = DeviceUpdatesTableModel(conn, parent=self)
+        self.model.modelReset.connect(self.update_register_count)
 
-        updates = queries.get_latest_device_updates(conn)
-
-        for row in updates:
-            items = [QStandardItem(str(field)) for field in row]
-            self.model.appendRow(items)
-            
         self.table_widget = QTableView()
         self.table_widget.setModel(self.model)
-        self.table_widget.setSortingEnabled(True)
+        self.table_widget.horizontalHeader().setSortIndicator(len(COLUMNS) - 1, Qt.SortOrder.DescendingOrder)
+        self.table_widget.setSortingEnabled(True)  # ordena en la base de datos y carga la primera página
         self.table_widget.setEditTriggers(QTableView.NoEditTriggers)
         self.table_widget.resizeColumnsToContents()
 
+        self.register_manufacturer_cb = QComboBox()
+        self.register_manufacturer_cb.addItem("Todas")
+        self.register_manufacturer_cb.addItems(self.cache.manufacturers())
+        self.register_manufacturer_cb.currentTextChanged.connect(self.update_register_models)
+
+        self.register_model_cb = QComboBox()
+        self.register_model_cb.addItem("Todos")
+        self.register_model_cb.addItems(self.cache.models())
+        self.register_model_cb.currentTextChanged.connect(self.apply_register_filters)
+
+        register_filter_layout = QHBoxLayout()
+        register_filter_layout.addWidget(QLabel("Fabricante:"))
+        register_filter_layout.addWidget(self.register_manufacturer_cb)
+        register_filter_layout.addWidget(QLabel("Modelo:"))
+        register_filter_layout.addWidget(self.register_model_cb)
+        register_filter_layout.addStretch()
+        register_filter_layout.addWidget(self.register_count_label)
+
+        self.register_widget = QWidget()
+        register_layout = QVBoxLayout(self.register_widget)
+        register_layout.addLayout(register_filter_layout)
+        register_layout.addWidget(self.table_widget)
+
         self.new_update_widget = QWidget()
         grid = QGridLayout(self.new_update_widget)
 
         grid.addWidget(QLabel("Fabricante:"), 0, 0)
         self.manufacturer_cb = QComboBox()
         self.manufacturer_cb.addItem("Todas")
-        manufacturers = queries.get_manufacturers(conn)
+        manufacturers = self.cache.manufacturers()
         self.manufacturer_cb.addItems(manufacturers)
         grid.addWidget(self.manufacturer_cb, 0, 1)
         self.manufacturer_cb.currentTextChanged.connect(self.update_model_list)
@@ -59,7 +84,7 @@ class UpdatesDialog(QDialog):
 
         self.tab_layout = QTabWidget()
         self.tab_layout.addTab(self.new_update_widget, "Nueva actualización")
-        self.tab_layout.addTab(self.table_widget, "Registro de actualizaciones")
+        self.tab_layout.addTab(self.register_widget, "Registro de actualizaciones")
 
         main_layout = QVBoxLayout()
         main_layout.addWidget(self.tab_layout)
@@ -67,7 +92,7 @@ class UpdatesDialog(QDialog):
 
     def update_model_list(self):
         manufacturer_filter = self.manufacturer_cb.currentText()
-        models = queries.get_models_by_manufacturer(self.conn, manufacturer_filter)
+        models = self.cache.models(manufacturer_filter)
 
         self.model_list.blockSignals(True)
         self.model_list.clear()
@@ -78,9 +103,29 @@ class UpdatesDialog(QDialog):
             self.model_list.addItem(item)
         self.model_list.blockSignals(False)
 
+    def update_register_models(self):
+        self.register_model_cb.blockSignals(True)
+        self.register_model_cb.clear()
+        self.register_model_cb.addItem("Todos")
+        self.register_model_cb.addItems(self.cache.models(self.register_manufacturer_cb.currentText()))
+        self.register_model_cb.blockSignals(False)
+        self.apply_register_filters()
+
+    def apply_register_filters(self):
+        """Aplica en SQL los filtros del registro y vuelve a cargar la primera página."""
+        manufacturer = self.register_manufacturer_cb.currentText()
+        model = self.register_model_cb.currentText()
+        self.model.set_filters(
+            None if manufacturer == "Todas" else manufacturer,
+            None if model == "Todos" else [model]
+        )
+
+    def update_register_count(self):
+        self.register_count_label.setText(f"{self.model.total_count()} actualizaciones")
+
     def add_device_update(self):
         manufacturer = self.manufacturer_cb.currentText()
-        version = self.version_edit.text().strip()
+        version = normalize_version(self.version_edit.text())
 
         selected_models = []
         for i in range(self.model_list.count()):
@@ -93,29 +138,23 @@ class UpdatesDialog(QDialog):
             return False
 
         try:
-            added_any = False
-            for model in selected_models:
-                if queries.add_device_update(self.conn, manufacturer, model, "v" + version):
-                    added_any = True
-
-            if added_any:
-                current_text = self.version_edit.text()
-                if current_text:
-                    self.version_edit.setText(f"{current_text},{version}")
-                else:
-                    self.version_edit.setText(version)
-
-                self.model.removeRows(0, self.model.rowCount())
-                updates = queries.get_latest_device_updates(self.conn)
-                for row in updates:
-                    items = [QStandardItem(str(field)) for field in row]
-                    self.model.appendRow(items)
+            entries = [(manufacturer, model, version) for model in selected_models]
+            added, duplicates = queries.add_device_updates(self.conn, entries)
+
+            if added:
+                self.added_updates = True
+                # Basta con releer la primera página del orden y los filtros actuales
+                self.model.refresh()
 
                 self.version_edit.clear()
                 for i in range(self.model_list.count()):
                     self.model_list.item(i).setCheckState(Qt.Unchecked)
 
-                QMessageBox.information(self, "Éxito", "Actualización añadida correctamente.")
+                message = "Actualización añadida correctamente."
+                if duplicates:
+                    existing = ", ".join(model for _, model, _ in duplicates)
+                    message += f"\nLa versión ya existía para: {existing}"
+                QMessageBox.information(self, "Éxito", message)
                 return True
             else:
                 QMessageBox.information(self, "Info", "La versión ya existe para los modelos seleccionados.")
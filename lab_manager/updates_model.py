@@ -0,0 +1,103 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from lab_manager.data import queries
+
+PAGE_SIZE = 200
+
+# (título, clave de orden en queries.REGISTER_SORT_COLUMNS, posición en la fila del valor por el que
+# se ordena); la posición de cada columna coincide con la de la fila
+COLUMNS = [
+    ("Fabricante", "manufacturer", 0),
+    ("Modelo", "model", 1),
+    ("Versión", "version", 5),  # version_key, no el texto
+    ("Fecha", "created_at", 3),
+]
+ID_COLUMN = 4  # posición de update_id en las filas de get_device_updates_page
+
+
+class DeviceUpdatesTableModel(QAbstractTableModel):
+    """
+    Registro de actualizaciones cargado por páginas según se desplaza la vista (canFetchMore/fetchMore).
+    La ordenación y los filtros se resuelven en SQL con paginación por clave sobre (columna de orden, id),
+    así que abrir el registro cuesta una página aunque el historial tenga decenas de miles de filas.
+    """
+    def __init__(self, conn, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self.page_size = page_size
+        self.sort_column = len(COLUMNS) - 1
+        self.descending = True
+        self.manufacturer = None
+        self.models = None
+        self._rows = []
+        self._exhausted = False
+
+    def set_filters(self, manufacturer=None, models=None):
+        self.manufacturer = manufacturer
+        self.models = models
+        self.refresh()
+
+    def refresh(self):
+        """Descarta las filas cargadas y vuelve a leer la primera página."""
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def total_count(self):
+        """Número total de actualizaciones con los filtros actuales."""
+        return queries.count_device_updates(self.conn, self.manufacturer, self.models)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return str(self._rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section][0]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = None
+        if self._rows:
+            last = self._rows[-1]
+            after = (last[COLUMNS[self.sort_column][2]], last[ID_COLUMN])
+
+        rows = queries.get_device_updates_page(
+            self.conn, COLUMNS[self.sort_column][1], self.descending, after, self.page_size,
+            self.manufacturer, self.models
+        )
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Ordena en la base de datos y vuelve a cargar desde la primera página."""
+        self.sort_column = column
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
@@ -1 +1 @@
-__all__ = ["export_to_excel", "get_unique_excel_path"]
\ No newline at end of file
+__all__ = ["export_to_excel", "get_unique_excel_path", "write_rows", "write_xlsx", "write_csv", "write_json", "export_dashboard"]
\ No newline at end of file
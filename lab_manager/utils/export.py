@@ -1,12 +1,129 @@
 # utils/export.py
-import pandas as pd
+import csv
+import json
 from pathlib import Path
 import datetime
 
+from lab_manager.data import queries
+
+DASHBOARD_COLUMNS = ["Workstation", "Técnico", "PC", "Fabricante", "Modelo", "Versión", "Actualizado"]
+PROGRESS_EVERY = 1000  # filas entre avisos de progreso y comprobaciones de cancelación
+
+
+class ExportCancelled(Exception):
+    """Se lanza cuando se cancela una exportación en curso."""
+
+
 def export_to_excel(data: list[dict], file_path=None):
     if not data or not file_path:
         return None
 
+    # pandas solo se importa al exportar: cargarlo al arrancar retrasa mucho la primera ventana
+    import pandas as pd
+
     df = pd.DataFrame(data)
     df.to_excel(file_path, index=False)
-    return file_path
\ No newline at end of file
+    return file_path
+
+
+def _stream_rows(rows, append, progress=None, is_cancelled=None):
+    """Pasa cada fila a append, avisando del progreso y comprobando la cancelación cada PROGRESS_EVERY filas."""
+    written = 0
+    for row in rows:
+        append(row)
+        written += 1
+        if written % PROGRESS_EVERY == 0:
+            if is_cancelled and is_cancelled():
+                raise ExportCancelled()
+            if progress:
+                progress(written)
+    if progress:
+        progress(written)
+    return written
+
+
+def write_xlsx(rows, file_path, columns, progress=None, is_cancelled=None) -> int:
+    """
+    Escribe las filas en un .xlsx con openpyxl en modo write-only: las filas se vuelcan a disco
+    según llegan, así que la memoria no crece con el número de filas. Devuelve las filas escritas.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(columns)
+    written = _stream_rows(rows, ws.append, progress, is_cancelled)
+    wb.save(file_path)
+    return written
+
+
+def write_csv(rows, file_path, columns, progress=None, is_cancelled=None) -> int:
+    """Escribe las filas en un .csv (UTF-8 con BOM para que Excel lo abra bien). Devuelve las filas escritas."""
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        return _stream_rows(rows, writer.writerow, progress, is_cancelled)
+
+
+def write_json(rows, file_path, columns, progress=None, is_cancelled=None) -> int:
+    """Escribe las filas como una lista JSON de objetos, una fila por línea. Devuelve las filas escritas."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        first = True
+
+        def append(row):
+            nonlocal first
+            f.write("\n" if first else ",\n")
+            f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str))
+            first = False
+
+        written = _stream_rows(rows, append, progress, is_cancelled)
+        f.write("\n]\n")
+        return written
+
+
+WRITERS = {
+    ".xlsx": write_xlsx,
+    ".csv": write_csv,
+    ".json": write_json,
+}
+
+
+def write_rows(rows, file_path, columns, progress=None, is_cancelled=None) -> int:
+    """
+    Escribe un iterable de filas en el formato que indica la extensión de file_path.
+    Si la exportación falla o se cancela se borra el fichero incompleto.
+    """
+    path = Path(file_path)
+    writer = WRITERS.get(path.suffix.lower())
+    if writer is None:
+        raise ValueError(f"Formato de exportación no soportado: {path.suffix}")
+
+    try:
+        return writer(rows, path, columns, progress, is_cancelled)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+def dashboard_rows(conn, manufacturer=None, models=None, pending_only=False, limit_per_model=2, supersede=False):
+    """Filas de exportación del dashboard, con la columna Actualizado como booleano."""
+    for *row, confirmed in queries.iter_dashboard_rows(conn, manufacturer, models, pending_only, limit_per_model,
+                                                       supersede):
+        yield (*row, bool(confirmed))
+
+
+def export_dashboard(conn, file_path, manufacturer=None, models=None, pending_only=False,
+                     limit_per_model=2, progress=None, is_cancelled=None, supersede=False) -> int:
+    """
+    Exporta en streaming las filas del dashboard con los filtros indicados.
+    progress, si se indica, recibe (filas escritas, filas totales). Devuelve las filas escritas.
+    Con supersede una versión confirmada da por confirmadas las anteriores del mismo dispositivo.
+    """
+    query_args = (manufacturer, models, pending_only, limit_per_model, supersede)
+    report = None
+    if progress:
+        total = queries.count_dashboard_rows(conn, *query_args)
+        report = lambda done: progress(done, total)
+
+    return write_rows(dashboard_rows(conn, *query_args), file_path, DASHBOARD_COLUMNS, report, is_cancelled)
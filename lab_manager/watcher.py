@@ -0,0 +1,52 @@
+import sqlite3
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from lab_manager.data import queries
+
+POLL_INTERVAL_MS = 2000
+
+
+class ChangeWatcher(QObject):
+    """
+    Detecta los cambios que otras conexiones (otras estaciones o procesos) hacen en la base de datos.
+    En cada intervalo consulta PRAGMA data_version, que solo cambia cuando otra conexión confirma
+    una escritura; si ha cambiado, compara los contadores de TableVersions y emite tables_changed
+    con el conjunto de tablas modificadas. Si nada ha cambiado el coste es un único PRAGMA.
+    """
+    tables_changed = Signal(object)
+
+    def __init__(self, manager, interval_ms=POLL_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self._data_version = None
+        self._versions = {}
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        conn = self.manager.writer()
+        self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        self._versions = queries.get_table_versions(conn)
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def poll(self):
+        conn = self.manager.writer()
+        try:
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            versions = queries.get_table_versions(conn)
+        except sqlite3.Error:
+            # Base de datos bloqueada u ocupada: se vuelve a intentar en el siguiente intervalo
+            return
+
+        self._data_version = data_version
+        changed = {table for table, version in versions.items() if self._versions.get(table) != version}
+        self._versions = versions
+        if changed:
+            self.tables_changed.emit(changed)
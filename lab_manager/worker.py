@@ -0,0 +1,148 @@
+import threading
+from itertools import count
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from lab_manager.data.database import get_manager
+
+# Hilos del pool. Cada hilo mantiene su conexión de lectura (ConnectionManager.reader) mientras vive,
+# así que el pool no los deja caducar: con el límite por defecto de Qt se crearían hilos, y
+# conexiones, nuevos tras cada pausa.
+MAX_THREADS = 4
+
+
+class _TaskSignals(QObject):
+    finished = Signal(str, int, object)
+    failed = Signal(str, int, str)
+    progress = Signal(str, int, int, int)
+
+
+class QueryTask(QRunnable):
+    """
+    Ejecuta func(conn, *args, **kwargs) en un hilo del pool con la conexión de lectura de ese hilo.
+    Con with_progress=True la llamada es func(conn, report_progress, is_cancelled, *args, **kwargs).
+    cancel() interrumpe la consulta en curso; una tarea cancelada no emite resultados.
+    """
+    def __init__(self, key, request_id, manager, func, args, kwargs, with_progress=False):
+        super().__init__()
+        self.key = key
+        self.request_id = request_id
+        self.signals = _TaskSignals()
+        self._manager = manager
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._with_progress = with_progress
+        self._conn = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._conn = self._manager.reader()
+
+        try:
+            if self._with_progress:
+                result = self._func(self._conn, self.report_progress, self.is_cancelled, *self._args, **self._kwargs)
+            else:
+                result = self._func(self._conn, *self._args, **self._kwargs)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.key, self.request_id, str(e))
+            return
+        finally:
+            with self._lock:
+                self._conn = None
+
+        if not self._cancelled:
+            self.signals.finished.emit(self.key, self.request_id, result)
+
+    def report_progress(self, done, total):
+        if not self._cancelled:
+            self.signals.progress.emit(self.key, self.request_id, done, total)
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class QueryWorker(QObject):
+    """
+    Lanza consultas fuera del hilo de la interfaz y entrega los resultados por señales.
+    Las peticiones se agrupan por clave: una nueva petición con la misma clave cancela la
+    anterior y los resultados de peticiones superadas se descartan.
+    """
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+    progress = Signal(str, int, int)
+
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or get_manager()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(MAX_THREADS)
+        self.pool.setExpiryTimeout(-1)
+        self._ids = count(1)
+        self._tasks = {}
+
+    def submit(self, key, func, *args, **kwargs):
+        """Ejecuta func(conn, *args, **kwargs) en segundo plano y devuelve el id de la petición."""
+        return self._start(key, func, args, kwargs, with_progress=False)
+
+    def submit_with_progress(self, key, func, *args, **kwargs):
+        """
+        Como submit, pero func recibe además report_progress(done, total) e is_cancelled(),
+        y el avance se reenvía por la señal progress.
+        """
+        return self._start(key, func, args, kwargs, with_progress=True)
+
+    def _start(self, key, func, args, kwargs, with_progress):
+        self.cancel(key)
+
+        request_id = next(self._ids)
+        task = QueryTask(key, request_id, self.manager, func, args, kwargs, with_progress)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        task.signals.progress.connect(self._on_progress)
+        self._tasks[key] = task
+        self.pool.start(task)
+        return request_id
+
+    def is_pending(self, key):
+        return key in self._tasks
+
+    def cancel(self, key):
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        for key in list(self._tasks):
+            self.cancel(key)
+
+    def _is_current(self, key, request_id):
+        task = self._tasks.get(key)
+        return task is not None and task.request_id == request_id
+
+    def _on_finished(self, key, request_id, result):
+        if not self._is_current(key, request_id):
+            return
+        del self._tasks[key]
+        self.finished.emit(key, result)
+
+    def _on_progress(self, key, request_id, done, total):
+        if self._is_current(key, request_id):
+            self.progress.emit(key, done, total)
+
+    def _on_failed(self, key, request_id, message):
+        if not self._is_current(key, request_id):
+            return
+        del self._tasks[key]
+        self.failed.emit(key, message)